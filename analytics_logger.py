@@ -3,34 +3,114 @@ Persistent logging of emotion events and retrieval for analytics."""
 
 from __future__ import annotations
 
-import math
+import atexit
+import os
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
-from security_utils import decrypt_text, destroy_key_material, encrypt_text
+from security_utils import blind_index, decrypt_text, destroy_key_material, encrypt_text
 
 _DB_PATH = Path("emotion_insights.db")
+_MEMORY_DB = ":memory:"
+_DATA_TABLES = ("emotion_events", "recommendation_events", "story_feedback", "game_events")
+_CACHED_STATEMENTS = 256
+_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+_SQL_INSERT_EMOTION_EVENT = (
+    "INSERT INTO emotion_events (timestamp, source, emotion, confidence, details, source_hash) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_INSERT_RECOMMENDATION_EVENT = (
+    "INSERT INTO recommendation_events (timestamp, emotion, category, title, action, metadata, emotion_hash) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_INSERT_STORY_FEEDBACK = (
+    "INSERT INTO story_feedback (timestamp, emotion, action, story, profile_name, generator) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_INSERT_GAME_EVENT = (
+    "INSERT INTO game_events (timestamp, emotion, difficulty, choice_label, outcome, reward, details) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+# confidence is stored as an integer count of hundredths of a percent.
+_CONFIDENCE_SCALE = 100
+
+_SQL_CREATE_EMOTION_EVENTS = """
+    CREATE TABLE IF NOT EXISTS emotion_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL,
+        source TEXT NOT NULL,
+        emotion TEXT NOT NULL,
+        confidence INTEGER NOT NULL,
+        details TEXT,
+        source_hash TEXT
+    )
+"""
+_SQL_CREATE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_emotion_events_timestamp ON emotion_events(timestamp DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_emotion_events_source_hash ON emotion_events(source_hash, timestamp DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_recommendation_events_emotion_hash ON recommendation_events(emotion_hash)",
+)
+_SQL_SELECT_EVENTS = "SELECT timestamp, source, emotion, confidence, details FROM emotion_events"
+# LIMIT is always bound (-1 means no limit) so the statement text stays constant.
+_SQL_SELECT_RECENT_EVENTS = _SQL_SELECT_EVENTS + " ORDER BY timestamp DESC LIMIT ?"
+_SQL_SELECT_RECENT_ANALYTICS = (
+    "SELECT timestamp, emotion, confidence FROM emotion_events ORDER BY timestamp DESC LIMIT ?"
+)
+# AUTOINCREMENT ids only grow between purges, so (count, max id) changes on every insert.
+# purge_all_data resets sqlite_sequence, so events_signature also carries _purge_generation.
+_SQL_SELECT_EVENTS_SIGNATURE = "SELECT COUNT(*), MAX(id) FROM emotion_events"
+_SQL_SELECT_FEEDBACK = "SELECT emotion, category, title, action FROM recommendation_events"
+_SQL_SELECT_FEEDBACK_BY_EMOTION = _SQL_SELECT_FEEDBACK + " WHERE emotion_hash = ?"
+
+# Every log_* caller passes datetime.isoformat() output: naive local time, optional microseconds.
+_TIMESTAMP_FORMAT = "ISO8601"
+_EVENT_COLUMNS = ("timestamp", "source", "emotion", "confidence", "details")
+_ANALYTICS_COLUMNS = ("timestamp", "emotion", "confidence")
+_FEEDBACK_COLUMNS = ("emotion", "category", "title", "action")
+
+_FETCH_CHUNK_ROWS = 10_000
+# Ciphertexts are unique per row (random nonce); the cache pays off across repeated
+# fetches of the same recent window, e.g. the forecaster on every Streamlit rerun.
+_DECRYPT_CACHE_SIZE = 16_384
+_PARALLEL_DECRYPT_MIN_TOKENS = 256
+
+_QUEUE_MAX_ROWS = 10_000
+_FLUSH_INTERVAL_SECONDS = 0.05
+_FLUSH_MAX_ROWS = 256
+
+EmotionEventRow = Tuple[str, str, str, float, Optional[str]]
+
+_pool: Dict[str, Tuple[sqlite3.Connection, threading.RLock]] = {}
+_pool_lock = threading.Lock()
+
+_worker: Optional["_LogWorker"] = None
+_worker_lock = threading.Lock()
+
+_decrypt_pool: Optional[ThreadPoolExecutor] = None
+_decrypt_pool_lock = threading.Lock()
+_purge_generation = 0
 
 
 def initialize_database(db_path: Path = _DB_PATH) -> None:
     db_path.parent.mkdir(parents=True, exist_ok=True)
     with _connect(db_path) as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS emotion_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                source TEXT NOT NULL,
-                emotion TEXT NOT NULL,
-                confidence REAL NOT NULL,
-                details TEXT
-            )
-            """
-        )
+        conn.execute(_SQL_CREATE_EMOTION_EVENTS)
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS recommendation_events (
@@ -40,7 +120,8 @@ def initialize_database(db_path: Path = _DB_PATH) -> None:
                 category TEXT NOT NULL,
                 title TEXT NOT NULL,
                 action TEXT NOT NULL,
-                metadata TEXT
+                metadata TEXT,
+                emotion_hash TEXT
             )
             """
         )
@@ -71,16 +152,97 @@ def initialize_database(db_path: Path = _DB_PATH) -> None:
             )
             """
         )
+        _ensure_blind_index(conn, "emotion_events", "source", "source_hash")
+        _ensure_blind_index(conn, "recommendation_events", "emotion", "emotion_hash")
+        _migrate_real_confidence(conn)
+        for statement in _SQL_CREATE_INDEXES:
+            conn.execute(statement)
         conn.commit()
+        conn.execute("PRAGMA optimize")
+
+
+def _migrate_real_confidence(conn: sqlite3.Connection) -> None:
+    declared = {row[1]: str(row[2]).upper() for row in conn.execute("PRAGMA table_info(emotion_events)")}
+    if declared.get("confidence") != "REAL":
+        return
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("ALTER TABLE emotion_events RENAME TO emotion_events_legacy")
+    conn.execute(_SQL_CREATE_EMOTION_EVENTS)
+    conn.execute(
+        f"""
+        INSERT INTO emotion_events (id, timestamp, source, emotion, confidence, details, source_hash)
+        SELECT id, timestamp, source, emotion, CAST(ROUND(confidence * {_CONFIDENCE_SCALE}) AS INTEGER),
+               details, source_hash
+        FROM emotion_events_legacy
+        """
+    )
+    conn.execute("DROP TABLE emotion_events_legacy")
+    conn.commit()
+
+
+def _ensure_blind_index(conn: sqlite3.Connection, table: str, column: str, hash_column: str) -> None:
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if hash_column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {hash_column} TEXT")
+    missing = conn.execute(f"SELECT id, {column} FROM {table} WHERE {hash_column} IS NULL").fetchall()
+    if missing:
+        conn.executemany(
+            f"UPDATE {table} SET {hash_column} = ? WHERE id = ?",
+            [(_index_hash(_try_decrypt(value)), row_id) for row_id, value in missing],
+        )
 
 
 @contextmanager
 def _connect(db_path: Path):
-    conn = sqlite3.connect(db_path)
-    try:
-        yield conn
-    finally:
-        conn.close()
+    conn, lock = _pooled_connection(db_path)
+    with lock:
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def _pool_key(db_path: Path) -> str:
+    if str(db_path) == _MEMORY_DB:
+        return _MEMORY_DB
+    return str(Path(db_path).resolve())
+
+
+def _pooled_connection(db_path: Path) -> Tuple[sqlite3.Connection, threading.RLock]:
+    key = _pool_key(db_path)
+    with _pool_lock:
+        entry = _pool.get(key)
+        if entry is None:
+            conn = sqlite3.connect(
+                db_path,
+                check_same_thread=False,
+                cached_statements=_CACHED_STATEMENTS,
+            )
+            _apply_pragmas(conn, db_path)
+            entry = (conn, threading.RLock())
+            _pool[key] = entry
+        return entry
+
+
+def _apply_pragmas(conn: sqlite3.Connection, db_path: Path) -> None:
+    if str(db_path) != _MEMORY_DB:
+        conn.execute("PRAGMA journal_mode=WAL")
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+
+
+def _close_all() -> None:
+    with _pool_lock:
+        entries = list(_pool.values())
+        _pool.clear()
+    for conn, lock in entries:
+        with lock:
+            conn.close()
+
+
+atexit.register(_close_all)
 
 
 def _encrypt_field(value: Optional[str]) -> Optional[str]:
@@ -92,18 +254,56 @@ def _encrypt_field(value: Optional[str]) -> Optional[str]:
     return encrypt_text(text)
 
 
-def _decrypt_field(value: Any) -> Optional[str]:
+def _index_hash(value: Optional[str]) -> Optional[str]:
     if value is None:
         return None
-    if isinstance(value, float) and math.isnan(value):
-        return None
-    text = str(value)
-    if not text:
-        return text
+    return blind_index(str(value).strip().lower())
+
+
+@lru_cache(maxsize=_DECRYPT_CACHE_SIZE)
+def _cached_decrypt(token: str) -> str:
+    return decrypt_text(token)
+
+
+def _try_decrypt(token: str) -> str:
     try:
-        return decrypt_text(text)
+        return _cached_decrypt(token)
     except Exception:
-        return text
+        return token
+
+
+def _text_array(values: Iterable[Any]) -> pd.api.extensions.ExtensionArray:
+    return pd.array(list(values), dtype="string")
+
+
+def _decrypt_column(values: pd.Series) -> pd.Series:
+    decrypted = values.copy()
+    tokens = values[values.notna()]
+    tokens = tokens[tokens != ""]
+    if tokens.empty:
+        return decrypted
+    unique_tokens = tokens.unique().tolist()
+    try:
+        if len(unique_tokens) >= _PARALLEL_DECRYPT_MIN_TOKENS:
+            plain = list(_get_decrypt_pool().map(_cached_decrypt, unique_tokens))
+        else:
+            plain = [_cached_decrypt(token) for token in unique_tokens]
+        mapping = dict(zip(unique_tokens, plain))
+    except Exception:
+        mapping = {token: _try_decrypt(token) for token in unique_tokens}
+    decrypted.loc[tokens.index] = tokens.map(mapping)
+    return decrypted
+
+
+def _get_decrypt_pool() -> ThreadPoolExecutor:
+    global _decrypt_pool
+    with _decrypt_pool_lock:
+        if _decrypt_pool is None:
+            _decrypt_pool = ThreadPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                thread_name_prefix="analytics-decrypt",
+            )
+        return _decrypt_pool
 
 
 def log_emotion_event(
@@ -114,18 +314,14 @@ def log_emotion_event(
     details: Optional[str] = None,
     db_path: Path = _DB_PATH,
 ) -> None:
-    with _connect(db_path) as conn:
-        conn.execute(
-            "INSERT INTO emotion_events (timestamp, source, emotion, confidence, details) VALUES (?, ?, ?, ?, ?)",
-            (
-                timestamp,
-                _encrypt_field(source),
-                _encrypt_field(emotion),
-                confidence,
-                _encrypt_field(details),
-            ),
-        )
-        conn.commit()
+    _submit("emotion_events", db_path, (timestamp, source, emotion, confidence, details))
+
+
+def log_emotion_events_bulk(
+    rows: Iterable[EmotionEventRow],
+    db_path: Path = _DB_PATH,
+) -> None:
+    _write_rows("emotion_events", list(rows), db_path)
 
 
 def log_recommendation_event(
@@ -137,101 +333,326 @@ def log_recommendation_event(
     metadata: Optional[str] = None,
     db_path: Path = _DB_PATH,
 ) -> None:
+    _submit(
+        "recommendation_events",
+        db_path,
+        (timestamp, emotion, category, title, action, metadata),
+    )
+
+
+def flush(timeout: Optional[float] = None) -> bool:
+    worker = _worker
+    if worker is None:
+        return True
+    return worker.flush(timeout)
+
+
+def _encrypt_emotion_row(row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    timestamp, source, emotion, confidence, details = row
+    return (
+        timestamp,
+        _encrypt_field(source),
+        _encrypt_field(emotion),
+        _encode_confidence(confidence),
+        _encrypt_field(details),
+        _index_hash(source),
+    )
+
+
+def _encode_confidence(confidence: float) -> int:
+    return int(round(float(confidence) * _CONFIDENCE_SCALE))
+
+
+def _encrypt_recommendation_row(row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    timestamp, emotion, category, title, action, metadata = row
+    return (
+        timestamp,
+        _encrypt_field(emotion),
+        _encrypt_field(category),
+        _encrypt_field(title),
+        _encrypt_field(action),
+        _encrypt_field(metadata),
+        _index_hash(emotion),
+    )
+
+
+def _encrypt_story_feedback_row(row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    timestamp, emotion, action, story, profile_name, generator = row
+    return (
+        timestamp,
+        _encrypt_field(emotion),
+        _encrypt_field(action),
+        _encrypt_field(story),
+        _encrypt_field(profile_name),
+        _encrypt_field(generator),
+    )
+
+
+def _encrypt_game_row(row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    timestamp, emotion, difficulty, choice_label, outcome, reward, details = row
+    return (
+        timestamp,
+        _encrypt_field(emotion),
+        _encrypt_field(difficulty),
+        _encrypt_field(choice_label),
+        _encrypt_field(outcome),
+        reward,
+        _encrypt_field(details),
+    )
+
+
+_TABLE_WRITERS: Dict[str, Tuple[str, Callable[[Tuple[Any, ...]], Tuple[Any, ...]]]] = {
+    "emotion_events": (_SQL_INSERT_EMOTION_EVENT, _encrypt_emotion_row),
+    "recommendation_events": (_SQL_INSERT_RECOMMENDATION_EVENT, _encrypt_recommendation_row),
+    "story_feedback": (_SQL_INSERT_STORY_FEEDBACK, _encrypt_story_feedback_row),
+    "game_events": (_SQL_INSERT_GAME_EVENT, _encrypt_game_row),
+}
+
+
+def _write_rows(table: str, rows: List[Tuple[Any, ...]], db_path: Path) -> None:
+    if not rows:
+        return
+    statement, encrypt_row = _TABLE_WRITERS[table]
+    encrypted = [encrypt_row(row) for row in rows]
     with _connect(db_path) as conn:
-        conn.execute(
-            """
-            INSERT INTO recommendation_events (timestamp, emotion, category, title, action, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                timestamp,
-                _encrypt_field(emotion),
-                _encrypt_field(category),
-                _encrypt_field(title),
-                _encrypt_field(action),
-                _encrypt_field(metadata),
-            ),
-        )
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(statement, encrypted)
         conn.commit()
 
 
+def _submit(table: str, db_path: Path, row: Tuple[Any, ...]) -> None:
+    if not _get_worker().submit(table, db_path, row):
+        _write_rows(table, [row], db_path)
+
+
+def _get_worker() -> "_LogWorker":
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = _LogWorker()
+            _worker.start()
+        return _worker
+
+
+class _LogWorker(threading.Thread):
+    """Encrypt and persist queued log rows off the caller's thread."""
+
+    def __init__(self) -> None:
+        super().__init__(name="analytics-log-writer", daemon=True)
+        self._queue: "queue.Queue[Tuple[str, Path, Tuple[Any, ...]]]" = queue.Queue(
+            maxsize=_QUEUE_MAX_ROWS
+        )
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+
+    def submit(self, table: str, db_path: Path, row: Tuple[Any, ...]) -> bool:
+        with self._pending_cond:
+            try:
+                self._queue.put_nowait((table, db_path, row))
+            except queue.Full:
+                return False
+            self._pending += 1
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        with self._pending_cond:
+            return self._pending_cond.wait_for(lambda: self._pending == 0, timeout)
+
+    def run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + _FLUSH_INTERVAL_SECONDS
+            while len(batch) < _FLUSH_MAX_ROWS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            finally:
+                with self._pending_cond:
+                    self._pending -= len(batch)
+                    self._pending_cond.notify_all()
+
+    @staticmethod
+    def _write_batch(batch: List[Tuple[str, Path, Tuple[Any, ...]]]) -> None:
+        grouped: Dict[Tuple[str, Path], List[Tuple[Any, ...]]] = {}
+        for table, db_path, row in batch:
+            grouped.setdefault((table, db_path), []).append(row)
+        for (table, db_path), rows in grouped.items():
+            try:
+                _write_rows(table, rows, db_path)
+            except Exception as error:
+                print(f"Failed to write {len(rows)} {table} rows: {error}")
+
+
+atexit.register(flush)
+
+
 def fetch_events(
     limit: Optional[int] = None,
     sources: Optional[Iterable[str]] = None,
     db_path: Path = _DB_PATH,
+    chunksize: Optional[int] = _FETCH_CHUNK_ROWS,
 ) -> pd.DataFrame:
-    apply_limit = limit if not sources else None
-    query = "SELECT timestamp, source, emotion, confidence, details FROM emotion_events ORDER BY timestamp DESC"
-    params: List[Any] = []
-    if apply_limit:
-        query += " LIMIT ?"
-        params.append(apply_limit)
+    flush()
+    row_limit = limit or -1
+    if sources:
+        hashes = sorted({_index_hash(src) for src in sources})
+        query = (
+            f"{_SQL_SELECT_EVENTS} WHERE source_hash IN ({', '.join('?' * len(hashes))}) "
+            "ORDER BY timestamp DESC LIMIT ?"
+        )
+        params: List[Any] = [*hashes, row_limit]
+    else:
+        query = _SQL_SELECT_RECENT_EVENTS
+        params = [row_limit]
 
-    with _connect(db_path) as conn:
-        df = pd.read_sql_query(query, conn, params=params or None)
+    return _read_events(query, params, _EVENT_COLUMNS, db_path, chunksize)
 
-    if df.empty:
-        return df
 
-    for column in ("source", "emotion", "details"):
-        df[column] = df[column].apply(_decrypt_field)
+def fetch_events_analytics(
+    limit: Optional[int] = None,
+    db_path: Path = _DB_PATH,
+    chunksize: Optional[int] = _FETCH_CHUNK_ROWS,
+) -> pd.DataFrame:
+    flush()
+    return _read_events(
+        _SQL_SELECT_RECENT_ANALYTICS,
+        [limit or -1],
+        _ANALYTICS_COLUMNS,
+        db_path,
+        chunksize,
+    )
 
-    if sources:
-        normalized = {str(src).lower() for src in sources}
-        df = df[df["source"].fillna("").str.lower().isin(normalized)]
 
-    if limit and df.shape[0] > limit:
-        df = df.head(limit)
+def events_signature(db_path: Path = _DB_PATH) -> Tuple[int, int, Optional[int]]:
+    """Return a cheap ``(purge_generation, row_count, max_id)`` token for emotion_events changes."""
+    flush()
+    with _connect(db_path) as conn:
+        count, max_id = conn.execute(_SQL_SELECT_EVENTS_SIGNATURE).fetchone()
+    return _purge_generation, int(count), max_id
+
 
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
+def _read_events(
+    query: str,
+    params: Sequence[Any],
+    columns: Sequence[str],
+    db_path: Path,
+    chunksize: Optional[int],
+) -> pd.DataFrame:
+    with _connect(db_path) as conn:
+        frames = [
+            _events_frame(rows, columns) for rows in _fetch_chunks(conn, query, params, chunksize)
+        ]
+
+    if not frames:
+        return pd.DataFrame(columns=list(columns))
+
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    df["timestamp"] = pd.to_datetime(
+        df["timestamp"],
+        format=_TIMESTAMP_FORMAT,
+        cache=True,
+    )
     return df.reset_index(drop=True)
 
 
+def _fetch_chunks(
+    conn: sqlite3.Connection,
+    query: str,
+    params: Sequence[Any],
+    chunksize: Optional[int],
+) -> Iterator[List[Tuple[Any, ...]]]:
+    cursor = conn.execute(query, params)
+    if not chunksize:
+        rows = cursor.fetchall()
+        if rows:
+            yield rows
+        return
+    while True:
+        rows = cursor.fetchmany(chunksize)
+        if not rows:
+            return
+        yield rows
+
+
+def _events_frame(rows: List[Tuple[Any, ...]], columns: Sequence[str]) -> pd.DataFrame:
+    data: Dict[str, Any] = {}
+    for name, values in zip(columns, zip(*rows)):
+        if name == "confidence":
+            data[name] = np.asarray(values, dtype=np.int64) / _CONFIDENCE_SCALE
+        elif name == "timestamp":
+            data[name] = _text_array(values)
+        else:
+            data[name] = _decrypt_column(pd.Series(_text_array(values)))
+    return pd.DataFrame(data)
+
+
 def emotion_summary(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame(columns=["emotion", "count", "percentage"])
-    counts = df["emotion"].value_counts().rename_axis("emotion").reset_index(name="count")
-    counts["percentage"] = (counts["count"] / counts["count"].sum() * 100).round(1)
-    return counts
+    counts = df["emotion"].value_counts()
+    values = counts.to_numpy()
+    return pd.DataFrame(
+        {
+            "emotion": counts.index,
+            "count": values,
+            "percentage": np.round(values / values.sum() * 100, 1),
+        }
+    )
 
 
 def daily_trends(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame()
     return (
-        df.assign(date=df["timestamp"].dt.date)
-        .groupby(["date", "emotion"]) ["confidence"].mean()
+        df.groupby([pd.Grouper(key="timestamp", freq="D"), "emotion"])["confidence"]
+        .mean()
         .reset_index()
+        .rename(columns={"timestamp": "date"})
     )
 
 
 def fetch_recommendation_feedback(
     emotion: Optional[str] = None,
     db_path: Path = _DB_PATH,
+    chunksize: Optional[int] = _FETCH_CHUNK_ROWS,
 ) -> pd.DataFrame:
-    with _connect(db_path) as conn:
-        df = pd.read_sql_query(
-            "SELECT emotion, category, title, action FROM recommendation_events",
-            conn,
-        )
-
-    if df.empty:
-        return df
+    flush()
+    if emotion:
+        query = _SQL_SELECT_FEEDBACK_BY_EMOTION
+        params: List[Any] = [_index_hash(emotion)]
+    else:
+        query = _SQL_SELECT_FEEDBACK
+        params = []
 
-    for column in ("emotion", "category", "title", "action"):
-        df[column] = df[column].apply(_decrypt_field)
+    with _connect(db_path) as conn:
+        partials = [_feedback_counts(rows) for rows in _fetch_chunks(conn, query, params, chunksize)]
 
-    if emotion:
-        target = emotion.lower()
-        df = df[df["emotion"].fillna("").str.lower() == target]
+    if not partials:
+        return pd.DataFrame(columns=[*_FEEDBACK_COLUMNS, "count"])
+    if len(partials) == 1:
+        return partials[0]
+    return (
+        pd.concat(partials, ignore_index=True)
+        .groupby(list(_FEEDBACK_COLUMNS))["count"]
+        .sum()
+        .reset_index()
+    )
 
-    if df.empty:
-        return pd.DataFrame(columns=["emotion", "category", "title", "action", "count"])
 
-    aggregated = (
-        df.groupby(["emotion", "category", "title", "action"]).size().reset_index(name="count")
+def _feedback_counts(rows: List[Tuple[Any, ...]]) -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            column: _decrypt_column(pd.Series(_text_array(values)))
+            for column, values in zip(_FEEDBACK_COLUMNS, zip(*rows))
+        }
     )
-    return aggregated
+    return df.groupby(list(_FEEDBACK_COLUMNS)).size().reset_index(name="count")
 
 
 def log_story_feedback(
@@ -244,22 +665,11 @@ def log_story_feedback(
     generator: str,
     db_path: Path = _DB_PATH,
 ) -> None:
-    with _connect(db_path) as conn:
-        conn.execute(
-            """
-            INSERT INTO story_feedback (timestamp, emotion, action, story, profile_name, generator)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                timestamp,
-                _encrypt_field(emotion),
-                _encrypt_field(action),
-                _encrypt_field(story),
-                _encrypt_field(profile_name),
-                _encrypt_field(generator),
-            ),
-        )
-        conn.commit()
+    _submit(
+        "story_feedback",
+        db_path,
+        (timestamp, emotion, action, story, profile_name, generator),
+    )
 
 
 def log_game_event(
@@ -273,27 +683,28 @@ def log_game_event(
     details: Optional[str] = None,
     db_path: Path = _DB_PATH,
 ) -> None:
-    with _connect(db_path) as conn:
-        conn.execute(
-            """
-            INSERT INTO game_events (timestamp, emotion, difficulty, choice_label, outcome, reward, details)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                timestamp,
-                _encrypt_field(emotion),
-                _encrypt_field(difficulty),
-                _encrypt_field(choice_label),
-                _encrypt_field(outcome),
-                reward,
-                _encrypt_field(details),
-            ),
-        )
-        conn.commit()
+    _submit(
+        "game_events",
+        db_path,
+        (timestamp, emotion, difficulty, choice_label, outcome, reward, details),
+    )
 
 
 def purge_all_data(*, db_path: Path = _DB_PATH, clear_key: bool = True) -> None:
+    global _purge_generation
+    flush()
     if db_path.exists():
-        db_path.unlink()
+        with _connect(db_path) as conn:
+            existing = {
+                row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
+            for table in (*_DATA_TABLES, "sqlite_sequence"):
+                if table in existing:
+                    conn.execute(f"DELETE FROM {table}")
+            conn.commit()
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    _purge_generation += 1
+    _cached_decrypt.cache_clear()
     if clear_key:
         destroy_key_material()
\ No newline at end of file
@@ -4,14 +4,28 @@
 from __future__ import annotations
 
 from datetime import datetime
+import hashlib
 import html
 import json
-from collections import Counter
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
-
+import re
+import string
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from heapq import nlargest
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+try:  # orjson is an optional speed-up for event detail payloads
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
 from emotion_detector import EmotionDetector
 from story_generator import StoryGenerator
 from voice_detector import VoiceEmotionDetector
@@ -20,6 +34,7 @@ from fusion import fuse_emotions
 from culture_adapters import (
     SUPPORTED_CULTURES,
     adjust_probabilities,
+    adjust_probabilities_batch,
     culture_story_directives,
     normalize_culture,
 )
@@ -35,7 +50,14 @@ from analytics_logger import (
     purge_all_data,
 )
 from recommendations import RecommendationEngine
-from profiles import UserProfile, delete_profile, load_profiles, purge_profiles, upsert_profile
+from profiles import (
+    UserProfile,
+    delete_profile,
+    load_profiles,
+    profiles_mtime,
+    purge_profiles,
+    upsert_profile,
+)
 from game_engine import EmotionAdaptiveGame
 from emotion_forecaster import EmotionForecaster, ForecastInsight
 
@@ -62,6 +84,47 @@ ALERT_STYLES: Dict[str, Dict[str, str]] = {
     "info": {"icon": "ℹ️", "accent": "#457B9D", "bg": "#E6F0FB"},
 }
 
+_BLEND_KEYS = ("fused_probs", "face_probs", "voice_probs", "text_probs")
+_PRIMARY_EMOTION_KEYS = ("fused_emotion", "current_emotion", "voice_emotion", "text_emotion")
+_LIST_SEPARATOR = re.compile(r"\s*,\s*")
+_MODALITY_PANELS = (
+    ("Voice Analysis", "voice", "Record a voice sample to view vocal emotion insights."),
+    ("Text Analysis", "text", "Analyze some text to view sentiment insights."),
+    (
+        "Fused Emotion",
+        "fused",
+        "Combine available modalities using the fusion controls to see the aggregated emotion.",
+    ),
+)
+_CULTURE_CODES = tuple(SUPPORTED_CULTURES)
+_CULTURE_INDEX = {code: position for position, code in enumerate(_CULTURE_CODES)}
+_COMPACT_SEPARATORS = (",", ":")
+
+_FORECAST_CARD_TEMPLATE = string.Template(
+    """
+    <div style="background-color:$background; border-left:4px solid $accent; padding:12px 14px; margin-bottom:12px; border-radius:6px;">
+        <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;">
+            <span style="font-weight:600; color:$accent;">$icon $label • $emotion outlook</span>
+            <span style="font-size:0.85rem; color:#555;">$timestamp</span>
+        </div>
+        <div style="margin-bottom:6px;">$badge</div>
+        <p style="margin:0 0 8px 0; color:#333;">$message</p>
+        <ul style="margin:0; padding-left:18px; color:#333;">$insights</ul>
+    </div>
+    """
+)
+
+# Entries are concatenated into one markdown call, so keep them unindented and free of blank
+# lines: either would end the HTML block and render later entries as code.
+_HISTORY_ENTRY_TEMPLATE = string.Template(
+    '<div style="padding:8px 0; border-bottom:1px solid #E0E0E0;">\n'
+    '<div style="margin-bottom:4px;">$badge</div>\n'
+    '<div style="font-size:0.85rem; color:#6C757D; margin-bottom:6px;">$timestamp • $source story</div>\n'
+    '<p style="margin:0;">$story</p>\n'
+    "</div>\n"
+)
+
+
 
 @st.cache_resource(show_spinner=False)
 def get_emotion_detector() -> EmotionDetector:
@@ -99,6 +162,31 @@ def get_emotion_forecaster() -> EmotionForecaster:
     return EmotionForecaster()
 
 
+_MODEL_LOADERS = (
+    get_emotion_detector,
+    get_story_generator,
+    get_text_analyzer,
+    get_recommendation_engine,
+    get_emotion_forecaster,
+    get_voice_detector,
+    get_game_engine,
+)
+
+
+def _warm_models() -> None:
+    if "_warm_futures" in st.session_state:
+        return
+    ctx = get_script_run_ctx()
+    executor = ThreadPoolExecutor(
+        max_workers=4,
+        thread_name_prefix="model-warmup",
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+    )
+    futures: List[Future] = [executor.submit(loader) for loader in _MODEL_LOADERS]
+    executor.shutdown(wait=False)
+    st.session_state["_warm_futures"] = futures
+
+
 def initialize_state() -> None:
     defaults = {
         "current_story": "",
@@ -109,15 +197,19 @@ def initialize_state() -> None:
         "voice_emotion": "",
         "voice_confidence": 0.0,
         "voice_probs": {},
+        "voice_probs_ranked": (),
         "face_probs": {},
+        "face_probs_ranked": (),
         "text_input": "",
         "text_emotion": "",
         "text_confidence": 0.0,
         "text_probs": {},
+        "text_probs_ranked": (),
         "fused_emotion": "",
         "fused_confidence": 0.0,
         "fused_probs": {},
-        "recommendation_shown_keys": [],
+        "fused_probs_ranked": (),
+        "recommendation_shown_keys": set(),
         "recommendation_feedback_message": "",
         "active_profile_name": "",
         "profile_edit_mode": False,
@@ -134,6 +226,7 @@ def initialize_state() -> None:
         "group_emotion": "",
         "group_confidence": 0.0,
         "group_probs": {},
+        "group_probs_ranked": (),
         "group_story": "",
         "group_ai_used": False,
         "group_story_feedback": "",
@@ -150,19 +243,44 @@ def initialize_state() -> None:
     }
     for key, value in defaults.items():
         st.session_state.setdefault(key, value)
-    if "profiles" not in st.session_state:
-        st.session_state["profiles"] = load_profiles()
+    if isinstance(st.session_state["recommendation_shown_keys"], list):
+        st.session_state["recommendation_shown_keys"] = set(st.session_state["recommendation_shown_keys"])
+    mtime = profiles_mtime()
+    if "profiles" not in st.session_state or st.session_state.get("_profiles_mtime") != mtime:
+        _set_profiles(_load_profiles_cached(mtime), mtime=mtime)
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_profiles_cached(mtime: int) -> Dict[str, UserProfile]:
+    return load_profiles()
+
+
+@lru_cache(maxsize=128)
 def emotion_badge(emotion: str, confidence: float) -> str:
-    color = EMOTION_COLORS.get(emotion.lower(), "#6C757D")
+    prefix = _BADGE_PREFIX.get(emotion.lower()) or _badge_prefix(_BADGE_DEFAULT_COLOR, emotion)
+    return prefix + format(confidence, ".1f") + _BADGE_SUFFIX
+
+
+def _badge_prefix(color: str, emotion: str) -> str:
     return (
         f"<span style='background-color:{color}; color:#fff; padding:4px 10px;"
         f" border-radius:16px; font-weight:600;'>"
-        f"{emotion.title()} • {confidence:.1f}%</span>"
+        f"{emotion.title()} • "
     )
 
 
+_BADGE_DEFAULT_COLOR = "#6C757D"
+_BADGE_SUFFIX = "%</span>"
+_BADGE_PREFIX: Dict[str, str] = {
+    emotion: _badge_prefix(color, emotion) for emotion, color in EMOTION_COLORS.items()
+}
+
+
+@lru_cache(maxsize=256)
+def _escape(text: str) -> str:
+    return html.escape(text)
+
+
 def build_story(
     story_generator: StoryGenerator,
     emotion: str,
@@ -174,7 +292,11 @@ def build_story(
     profile_context: Optional[Mapping[str, Any]] = None,
     emotion_blend: Optional[Dict[str, float]] = None,
     story_strategy: str = "dominant",
+    min_confidence: float = 0.0,
+    detected_confidence: Optional[float] = None,
 ) -> Tuple[str, bool]:
+    if detected_confidence is not None and detected_confidence < min_confidence:
+        use_ai = False
     seed_story = story_generator.select_story(emotion)
     prompt = story_generator.craft_personalized_prompt(  # type: ignore[attr-defined]
         emotion,
@@ -216,8 +338,13 @@ def build_group_story(
     story_strategy: str,
     emotion_blend: Optional[Dict[str, float]] = None,
     culture_hint: Optional[str] = None,
+    min_confidence: float = 0.0,
 ) -> Tuple[str, bool]:
     roster = list(participants)
+    if use_ai and min_confidence > 0 and roster:
+        mean_confidence = sum(float(item.get("confidence", 0.0)) for item in roster) / len(roster)
+        if mean_confidence < min_confidence:
+            use_ai = False
     guiding_emotion = (dominant_emotion or _fallback_group_emotion(roster) or "neutral").lower()
     culture_code = normalize_culture(culture_hint)
     seed_story = story_generator.select_story(guiding_emotion)
@@ -251,32 +378,50 @@ def build_group_story(
     return personalized, False
 
 
+def _analyze_text_cached(
+    analyzer: TextEmotionAnalyzer,
+    text: str,
+) -> Tuple[Optional[str], float, Dict[str, float]]:
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    emotion, confidence, probabilities = _cached_text_emotion(
+        analyzer.model_name, digest, analyzer, text
+    )
+    return emotion, confidence, dict(probabilities)
+
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_text_emotion(
+    model_name: str,
+    text_digest: str,
+    _analyzer: TextEmotionAnalyzer,
+    _text: str,
+) -> Tuple[Optional[str], float, Dict[str, float]]:
+    return _analyzer.analyze_emotion(_text)
+
+
 def _render_forecast_section(forecaster: EmotionForecaster) -> None:
     st.markdown("### Emotion Outlook")
+    caption = st.empty()
+    placeholder = st.empty()
+    cards: List[str] = []
     try:
-        forecasts = forecaster.generate_forecast()
+        for forecast in forecaster.iter_forecast():
+            if not cards:
+                caption.caption(
+                    "Projected moods for upcoming windows so you can plan supportive actions in advance."
+                )
+            cards.append(_forecast_card_html(forecast))
+            placeholder.markdown("\n".join(cards), unsafe_allow_html=True)
     except Exception as error:
         st.warning(f"Unable to generate emotion forecasts right now: {error}")
         return
 
-    if not forecasts:
-        st.caption("Forecasts appear after logging more emotion events across the day.")
-        return
-
-    st.caption("Projected moods for upcoming windows so you can plan supportive actions in advance.")
-    for forecast in forecasts:
-        _render_forecast_card(forecast)
+    if not cards:
+        caption.caption("Forecasts appear after logging more emotion events across the day.")
 
 
-def _render_forecast_card(forecast: ForecastInsight) -> None:
+def _forecast_card_html(forecast: ForecastInsight) -> str:
     style = ALERT_STYLES.get(forecast.alert_level, ALERT_STYLES["info"])
-    icon = style.get("icon", "ℹ️")
-    accent = style.get("accent", "#457B9D")
-    background = style.get("bg", "#E6F0FB")
-    timestamp_str = forecast.timestamp.strftime("%a %H:%M")
-    badge_html = emotion_badge(forecast.emotion, forecast.confidence)
-    message_text = html.escape(forecast.message)
-    emotion_label = html.escape(forecast.emotion.title())
 
     insights = list(forecast.insights or [])
     if forecast.secondary:
@@ -286,26 +431,35 @@ def _render_forecast_card(forecast: ForecastInsight) -> None:
         )
         insights.append(secondary_text)
 
-    insights_html = "".join(f"<li>{html.escape(item)}</li>" for item in insights)
+    insights_html = "".join(f"<li>{_escape(item)}</li>" for item in insights)
     if not insights_html:
         insights_html = "<li>Keep logging check-ins to sharpen future forecasts.</li>"
 
-    card_html = f"""
-    <div style=\"background-color:{background}; border-left:4px solid {accent}; padding:12px 14px; margin-bottom:12px; border-radius:6px;\">
-        <div style=\"display:flex; justify-content:space-between; align-items:center; margin-bottom:6px;\">
-            <span style=\"font-weight:600; color:{accent};\">{icon} {html.escape(forecast.label)} • {emotion_label} outlook</span>
-            <span style=\"font-size:0.85rem; color:#555;\">{html.escape(timestamp_str)}</span>
-        </div>
-        <div style=\"margin-bottom:6px;\">{badge_html}</div>
-        <p style=\"margin:0 0 8px 0; color:#333;\">{message_text}</p>
-        <ul style=\"margin:0; padding-left:18px; color:#333;\">{insights_html}</ul>
-    </div>
-    """
-    st.markdown(card_html, unsafe_allow_html=True)
+    return _FORECAST_CARD_TEMPLATE.substitute(
+        background=style.get("bg", "#E6F0FB"),
+        accent=style.get("accent", "#457B9D"),
+        icon=style.get("icon", "ℹ️"),
+        label=_escape(forecast.label),
+        emotion=_escape(forecast.emotion.title()),
+        timestamp=_escape(forecast.timestamp.strftime("%a %H:%M")),
+        badge=emotion_badge(forecast.emotion, forecast.confidence),
+        message=_escape(forecast.message),
+        insights=insights_html,
+    )
+
+
+def _history_entry_html(entry: Mapping[str, Any]) -> str:
+    return _HISTORY_ENTRY_TEMPLATE.substitute(
+        badge=emotion_badge(entry["emotion"], entry["confidence"]),
+        timestamp=_escape(str(entry["timestamp"])),
+        source="AI" if entry["ai_used"] else "Template",
+        story="<br>".join(html.escape(entry["story"]).splitlines()),
+    )
 
 
 def main() -> None:
     initialize_state()
+    _warm_models()
     purge_notice = st.session_state.pop("purge_notice", False)
 
     detector = get_emotion_detector()
@@ -341,15 +495,22 @@ def main() -> None:
 
         st.subheader("Narration")
         enable_tts = st.checkbox("Enable narration", value=True)
-        tts_rate = st.slider("Speech rate", 120, 220, 160)
-        tts_volume = st.slider("Volume", 0.4, 1.0, 0.9)
-        generator.set_tts_preferences(tts_rate, tts_volume, voice=None)
+        if enable_tts:
+            tts_rate = _sidebar_slider("Speech rate", 120, 220, 160, key="tts_rate", step=5)
+            tts_volume = _sidebar_slider("Volume", 0.4, 1.0, 0.9, key="tts_volume", step=0.05)
+            generator.set_tts_preferences(tts_rate, tts_volume, voice=None)
 
         st.subheader("Story Engine")
         use_ai = st.checkbox("Generate with AI (requires transformers)", value=False)
-        max_tokens = st.slider("Max new tokens", 80, 400, 220)
-        temperature = st.slider("Creativity (temperature)", 0.3, 1.2, 0.9)
-        top_p = st.slider("Nucleus sampling (top_p)", 0.1, 1.0, 0.92)
+        max_tokens = _sidebar_slider(
+            "Max new tokens", 80, 400, 220, key="max_tokens", enabled=use_ai, step=20
+        )
+        temperature = _sidebar_slider(
+            "Creativity (temperature)", 0.3, 1.2, 0.9, key="temperature", enabled=use_ai, step=0.1
+        )
+        top_p = _sidebar_slider(
+            "Nucleus sampling (top_p)", 0.1, 1.0, 0.92, key="top_p", enabled=use_ai, step=0.02
+        )
         strategy_options = {
             "Follow dominant emotion": "dominant",
             "Blend top intensities": "blend",
@@ -369,7 +530,9 @@ def main() -> None:
 
         st.subheader("Voice Analysis")
         enable_voice_capture = st.checkbox("Enable voice emotion capture", value=True)
-        voice_duration = st.slider("Recording duration (seconds)", 3, 10, 5)
+        voice_duration = _sidebar_slider(
+            "Recording duration (seconds)", 3, 10, 5, key="voice_duration", enabled=enable_voice_capture
+        )
         voice_detector = get_voice_detector() if enable_voice_capture else None
         if voice_detector:
             voice_detector.duration_seconds = voice_duration
@@ -383,18 +546,19 @@ def main() -> None:
             value=True,
             help="Surface music, podcasts, movement, or mindfulness content for the detected mood.",
         )
-        recommendations_per_category = st.slider(
+        recommendations_per_category = _sidebar_slider(
             "Suggestions per category",
-            min_value=1,
-            max_value=4,
-            value=2,
+            1,
+            4,
+            2,
+            key="recommendations_per_category",
+            enabled=enable_recommendations,
         )
 
         st.subheader("Manual emotion")
-        available_emotions = detector.available_emotions
         manual_emotion = st.selectbox(
             "Choose an emotion",
-            options=["(Select emotion)"] + list(available_emotions),
+            options=_manual_emotion_options(detector),
         )
         manual_generate = st.button("✨ Generate story without webcam")
 
@@ -403,17 +567,17 @@ def main() -> None:
             key="manual_group_add",
             use_container_width=True,
         ):
-            manual_probs = _apply_cultural_adjustment({manual_emotion: 100.0}, "text")
-            dominant_manual, dominant_manual_conf = _dominant_from_probabilities(
-                manual_probs,
+            manual_detection = _normalize_detection(
+                {manual_emotion: 100.0},
+                "text",
                 fallback=(manual_emotion, 100.0),
             )
-            manual_emotion = dominant_manual or manual_emotion
+            manual_emotion = manual_detection.emotion
             _append_group_participant(
                 label=f"Manual #{len(st.session_state.get('group_participants', [])) + 1}",
                 emotion=manual_emotion,
-                confidence=dominant_manual_conf if dominant_manual_conf else 100.0,
-                probabilities=manual_probs,
+                confidence=manual_detection.confidence,
+                probabilities=manual_detection.probabilities,
                 source="manual",
             )
             _log_group_event("manual")
@@ -457,8 +621,7 @@ def main() -> None:
             _clear_group_session()
 
         st.subheader("Personal profile")
-        profiles = _get_profiles()
-        profile_options = ["(No profile)"] + sorted(profiles.keys())
+        profile_options = ["(No profile)"] + _sorted_profile_names()
         active_profile = st.session_state.get("active_profile_name", "")
         default_index = profile_options.index(active_profile) if active_profile in profile_options else 0
         selected_profile = st.selectbox(
@@ -486,9 +649,9 @@ def main() -> None:
         if st.session_state.get("profile_edit_mode"):
             _render_profile_form()
         else:
-            preview = _get_profile_context()
+            preview = _active_profile_preview()
             if preview:
-                st.caption(_profile_preview_text(preview))
+                st.caption(preview)
 
         st.subheader("Emotion-Adaptive Game")
         difficulty_options = {
@@ -534,6 +697,7 @@ def main() -> None:
         ):
             purge_all_data()
             purge_profiles()
+            _load_profiles_cached.clear()
             initialize_database()
             st.session_state.clear()
             st.session_state["purge_notice"] = True
@@ -550,33 +714,34 @@ def main() -> None:
 
         if start_scan:
             with st.spinner("Accessing webcam. A preview window will open; press 'q' to cancel."):
+                threading.Thread(target=detector.warmup, name="face-warmup", daemon=True).start()
                 detection = detector.start_webcam_scan(
                     confidence_threshold=confidence_threshold,
                     timeout_seconds=timeout_seconds,
                 )
 
             if detection:
+                detected_at = datetime.now()
+                event_time = detected_at.isoformat()
                 detected_emotion, confidence, face_probabilities = detection
                 base_probs = face_probabilities or {detected_emotion or "neutral": confidence}
-                adjusted_face_probs = _apply_cultural_adjustment(base_probs, "face")
                 fallback_conf = confidence if confidence else max(base_probs.values() or [0.0])
-                dominant, dominant_conf = _dominant_from_probabilities(
-                    adjusted_face_probs,
+                detected_emotion, confidence, adjusted_face_probs = _normalize_detection(
+                    base_probs,
+                    "face",
                     fallback=(detected_emotion or "neutral", fallback_conf),
                 )
-                detected_emotion = dominant or (detected_emotion or "neutral")
-                confidence = dominant_conf if dominant_conf else fallback_conf
                 st.success(
                     f"Detected **{detected_emotion.title()}** with confidence {confidence:.1f}%"
                 )
                 log_emotion_event(
-                    datetime.now().isoformat(),
+                    event_time,
                     "face",
                     detected_emotion,
                     confidence,
                     details=_emotion_details_json(adjusted_face_probs, source="face"),
                 )
-                st.session_state["face_probs"] = adjusted_face_probs
+                st.session_state.update(_probability_slot("face_probs", adjusted_face_probs))
                 story_strategy = st.session_state.get("story_strategy", "dominant")
                 story, ai_used = build_story(
                     generator,
@@ -588,7 +753,11 @@ def main() -> None:
                     profile_context=_get_profile_context(),
                     emotion_blend=adjusted_face_probs,
                     story_strategy=story_strategy,
+                    min_confidence=confidence_threshold,
+                    detected_confidence=confidence,
                 )
+                if use_ai and not ai_used and confidence < confidence_threshold:
+                    st.caption("Low confidence detection, so a template story was used instead of AI.")
                 st.session_state.update(
                     {
                         "current_story": story,
@@ -597,12 +766,12 @@ def main() -> None:
                         "ai_used": ai_used,
                     }
                 )
-                _append_history(story, detected_emotion, confidence, ai_used)
+                _append_history(story, detected_emotion, confidence, ai_used, created_at=detected_at)
 
                 if enable_tts:
-                    generator.narrate_story(story)  # type: ignore[attr-defined]
+                    generator.narrate_story_async(story)  # type: ignore[attr-defined]
                 log_emotion_event(
-                    datetime.now().isoformat(),
+                    event_time,
                     "story",
                     detected_emotion,
                     confidence,
@@ -629,14 +798,11 @@ def main() -> None:
             if manual_emotion == "(Select emotion)":
                 st.warning("Pick an emotion from the dropdown first.")
             else:
-                manual_blend = _story_emotion_blend(manual_emotion) or {manual_emotion: 100.0}
-                manual_blend = _apply_cultural_adjustment(manual_blend, "text")
-                dominant_manual, dominant_manual_conf = _dominant_from_probabilities(
-                    manual_blend,
+                manual_emotion, manual_confidence, manual_blend = _normalize_detection(
+                    _story_emotion_blend(manual_emotion) or {manual_emotion: 100.0},
+                    "text",
                     fallback=(manual_emotion, 100.0),
                 )
-                manual_emotion = dominant_manual or manual_emotion
-                manual_confidence = dominant_manual_conf if dominant_manual_conf else 0.0
                 story, ai_used = build_story(
                     generator,
                     manual_emotion,
@@ -656,12 +822,13 @@ def main() -> None:
                         "ai_used": ai_used,
                     }
                 )
-                _append_history(story, manual_emotion, manual_confidence, ai_used)
+                created_at = datetime.now()
+                _append_history(story, manual_emotion, manual_confidence, ai_used, created_at=created_at)
                 st.success(f"Generated story for **{manual_emotion.title()}**.")
                 if enable_tts:
-                    generator.narrate_story(story)  # type: ignore[attr-defined]
+                    generator.narrate_story_async(story)  # type: ignore[attr-defined]
                 log_emotion_event(
-                    datetime.now().isoformat(),
+                    created_at.isoformat(),
                     "story_manual",
                     manual_emotion,
                     manual_confidence,
@@ -683,6 +850,7 @@ def main() -> None:
             with st.spinner(
                 "Accessing webcam for group scan. A preview window will open; press 'q' to cancel."
             ):
+                threading.Thread(target=detector.warmup, name="face-warmup", daemon=True).start()
                 group_detection = detector.start_group_scan(
                     confidence_threshold=confidence_threshold,
                     timeout_seconds=timeout_seconds,
@@ -704,28 +872,24 @@ def main() -> None:
         if enable_voice_capture and voice_detector:
             if st.button("🎤 Record voice sample", use_container_width=True):
                 with st.spinner(f"Recording for {voice_duration} seconds..."):
+                    threading.Thread(target=voice_detector.warmup, name="voice-warmup", daemon=True).start()
                     voice_emotion, voice_confidence, voice_probs = voice_detector.capture_and_analyze()
 
                 if voice_emotion:
                     formatted_voice_probs = VoiceEmotionDetector.format_probabilities(voice_probs)
-                    adjusted_voice_probs = _apply_cultural_adjustment(
-                        formatted_voice_probs or {voice_emotion: voice_confidence},
-                        "voice",
-                    )
                     fallback_voice_conf = voice_confidence if voice_confidence else max(
                         (formatted_voice_probs or {}).values() or [0.0]
                     )
-                    dominant_voice, dominant_conf = _dominant_from_probabilities(
-                        adjusted_voice_probs,
+                    voice_emotion, voice_confidence, adjusted_voice_probs = _normalize_detection(
+                        formatted_voice_probs or {voice_emotion: voice_confidence},
+                        "voice",
                         fallback=(voice_emotion, fallback_voice_conf),
                     )
-                    voice_emotion = dominant_voice or voice_emotion
-                    voice_confidence = dominant_conf if dominant_conf else fallback_voice_conf
                     st.session_state.update(
                         {
                             "voice_emotion": voice_emotion,
                             "voice_confidence": voice_confidence,
-                            "voice_probs": adjusted_voice_probs,
+                            **_probability_slot("voice_probs", adjusted_voice_probs),
                         }
                     )
                     st.success(
@@ -770,57 +934,46 @@ def main() -> None:
         face_weight = st.slider("Weight: Face", 0.1, 2.0, 1.0, step=0.1)
         voice_weight = st.slider("Weight: Voice", 0.1, 2.0, 1.0, step=0.1)
         text_weight = st.slider("Weight: Text", 0.1, 2.0, 1.0, step=0.1)
-        fusion_weights = {"face": face_weight, "voice": voice_weight, "text": text_weight}
         if st.button("🔗 Fuse available emotions", use_container_width=True):
-            modalities = []
-            face_emotion = st.session_state.get("current_emotion")
-            face_conf = st.session_state.get("current_confidence", 0.0)
-            if face_emotion and face_conf:
-                modalities.append(
-                    (
-                        "face",
-                        face_conf,
-                        st.session_state.get("face_probs", {}) or {face_emotion: face_conf},
-                    )
-                )
-            voice_emotion = st.session_state.get("voice_emotion")
-            if voice_emotion:
-                modalities.append(
-                    (
-                        "voice",
-                        st.session_state["voice_confidence"],
-                        st.session_state.get("voice_probs", {}),
-                    )
-                )
-            text_emotion = st.session_state.get("text_emotion")
-            if text_emotion:
-                modalities.append(
-                    (
-                        "text",
-                        st.session_state["text_confidence"],
-                        st.session_state.get("text_probs", {}),
-                    )
-                )
+            state = st.session_state
+            face_emotion = state.get("current_emotion")
+            face_conf = state.get("current_confidence", 0.0)
+            candidates = (
+                (
+                    face_emotion and face_conf,
+                    ("face", face_conf, state.get("face_probs", {}) or {face_emotion: face_conf}),
+                ),
+                (
+                    state.get("voice_emotion"),
+                    ("voice", state.get("voice_confidence", 0.0), state.get("voice_probs", {})),
+                ),
+                (
+                    state.get("text_emotion"),
+                    ("text", state.get("text_confidence", 0.0), state.get("text_probs", {})),
+                ),
+            )
+            modalities = [entry for present, entry in candidates if present]
 
             if not modalities:
                 st.warning("Generate at least one modality before fusing.")
             else:
-                fused = fuse_emotions(modalities, fusion_weights)
+                fused = fuse_emotions(
+                    modalities,
+                    {"face": face_weight, "voice": voice_weight, "text": text_weight},
+                )
                 fused_emotion, fused_confidence, fused_probs = fused
                 if fused_emotion:
-                    adjusted_fused_probs = _apply_cultural_adjustment(fused_probs, "fused")
-                    dominant_fused, dominant_fused_conf = _dominant_from_probabilities(
-                        adjusted_fused_probs,
+                    fused_emotion, fused_confidence, adjusted_fused_probs = _normalize_detection(
+                        fused_probs,
+                        "fused",
                         fallback=(fused_emotion, fused_confidence),
                     )
-                    fused_emotion = dominant_fused or fused_emotion
-                    fused_confidence = dominant_fused_conf if dominant_fused_conf else fused_confidence
                     fused_probs = adjusted_fused_probs or fused_probs
                     st.session_state.update(
                         {
                             "fused_emotion": fused_emotion,
                             "fused_confidence": fused_confidence,
-                            "fused_probs": fused_probs,
+                            **_probability_slot("fused_probs", fused_probs),
                         }
                     )
                     st.success(
@@ -861,7 +1014,7 @@ def main() -> None:
                                 text_emotion,
                                 text_confidence,
                                 text_probs,
-                            ) = text_analyzer.analyze_emotion(clean_text)
+                            ) = _analyze_text_cached(text_analyzer, clean_text)
                         except ImportError as error:
                             st.error(str(error))
                             text_emotion = None
@@ -870,24 +1023,19 @@ def main() -> None:
 
                     if text_emotion:
                         formatted_text_probs = TextEmotionAnalyzer.format_probabilities(text_probs)
-                        adjusted_text_probs = _apply_cultural_adjustment(
-                            formatted_text_probs or {text_emotion: text_confidence},
-                            "text",
-                        )
                         fallback_text_conf = text_confidence if text_confidence else max(
                             (formatted_text_probs or {}).values() or [0.0]
                         )
-                        dominant_text, dominant_text_conf = _dominant_from_probabilities(
-                            adjusted_text_probs,
+                        text_emotion, text_confidence, adjusted_text_probs = _normalize_detection(
+                            formatted_text_probs or {text_emotion: text_confidence},
+                            "text",
                             fallback=(text_emotion, fallback_text_conf),
                         )
-                        text_emotion = dominant_text or text_emotion
-                        text_confidence = dominant_text_conf if dominant_text_conf else fallback_text_conf
                         st.session_state.update(
                             {
                                 "text_emotion": text_emotion,
                                 "text_confidence": text_confidence,
-                                "text_probs": adjusted_text_probs,
+                                **_probability_slot("text_probs", adjusted_text_probs),
                             }
                         )
                         st.success(
@@ -926,24 +1074,24 @@ def main() -> None:
             st.caption("Text analysis disabled in the sidebar.")
 
     with col_right:
+        state = st.session_state
         _render_forecast_section(forecaster)
 
         st.markdown("### Story Output")
-        if st.session_state.get("current_story"):
-            badge_html = emotion_badge(
-                st.session_state["current_emotion"],
-                st.session_state["current_confidence"],
-            )
+        current_story = state.get("current_story")
+        if current_story:
+            badge_html = emotion_badge(state["current_emotion"], state["current_confidence"])
             st.markdown(badge_html, unsafe_allow_html=True)
-            context_details = _get_profile_context()
-            if context_details:
-                st.caption(_profile_preview_text(context_details))
-            if st.session_state.get("ai_used"):
+            preview = _active_profile_preview()
+            if preview:
+                st.caption(preview)
+            if state.get("ai_used"):
                 st.caption("Generated with Hugging Face text-generation pipeline")
-            st.write(st.session_state["current_story"])
-            if st.session_state.get("story_feedback_message"):
-                st.info(st.session_state["story_feedback_message"])
-                st.session_state["story_feedback_message"] = ""
+            st.write(current_story)
+            feedback_message = state.get("story_feedback_message")
+            if feedback_message:
+                st.info(feedback_message)
+                state["story_feedback_message"] = ""
             feedback_cols = st.columns(2)
             if feedback_cols[0].button(
                 "👍 Loved it",
@@ -959,91 +1107,60 @@ def main() -> None:
                 _handle_story_feedback("disliked")
             if st.button("🔊 Replay narration", use_container_width=True, key="replay"):
                 if enable_tts:
-                    generator.narrate_story(st.session_state["current_story"])  # type: ignore[attr-defined]
+                    generator.narrate_story_async(current_story)  # type: ignore[attr-defined]
                 else:
                     st.info("Enable narration in the sidebar to replay audio.")
         else:
             st.info("Stories you generate will appear here with emotion insights.")
 
         st.markdown("### Story History")
-        if st.session_state["history"]:
+        history = state["history"]
+        if history:
             with st.expander("Show previous stories", expanded=False):
-                for entry in reversed(st.session_state["history"]):
-                    badge_html = emotion_badge(entry["emotion"], entry["confidence"])
-                    st.markdown(badge_html, unsafe_allow_html=True)
-                    st.caption(
-                        f"{entry['timestamp']} • {'AI' if entry['ai_used'] else 'Template'} story"
-                    )
-                    st.write(entry["story"])
-                    st.divider()
+                st.markdown(
+                    "".join(_history_entry_html(entry) for entry in reversed(history)),
+                    unsafe_allow_html=True,
+                )
         else:
             st.caption("No stories yet. Start the scanner or generate one manually!")
 
         st.markdown("### Face Analysis")
-        face_probs = st.session_state.get("face_probs", {})
-        if face_probs:
-            _display_probability_breakdown(face_probs)
+        face_ranked = state.get("face_probs_ranked")
+        if face_ranked:
+            _display_probability_breakdown(face_ranked)
         else:
             st.caption("Run the webcam scanner to see facial emotion intensities.")
 
-        st.markdown("### Voice Analysis")
-        if st.session_state.get("voice_emotion"):
-            badge_html = emotion_badge(
-                st.session_state["voice_emotion"],
-                st.session_state["voice_confidence"],
-            )
-            st.markdown(badge_html, unsafe_allow_html=True)
-            probs = st.session_state.get("voice_probs", {})
-            if probs:
-                _display_probability_breakdown(probs)
-        else:
-            st.caption("Record a voice sample to view vocal emotion insights.")
-
-        st.markdown("### Text Analysis")
-        if st.session_state.get("text_emotion"):
-            badge_html = emotion_badge(
-                st.session_state["text_emotion"],
-                st.session_state["text_confidence"],
-            )
-            st.markdown(badge_html, unsafe_allow_html=True)
-            text_probs = st.session_state.get("text_probs")
-            if text_probs:
-                _display_probability_breakdown(text_probs)
-        else:
-            st.caption("Analyze some text to view sentiment insights.")
-
-        st.markdown("### Fused Emotion")
-        if st.session_state.get("fused_emotion"):
-            badge_html = emotion_badge(
-                st.session_state["fused_emotion"],
-                st.session_state["fused_confidence"],
-            )
-            st.markdown(badge_html, unsafe_allow_html=True)
-            fused_probs = st.session_state.get("fused_probs", {})
-            if fused_probs:
-                _display_probability_breakdown(fused_probs)
-        else:
-            st.caption(
-                "Combine available modalities using the fusion controls to see the aggregated emotion."
-            )
+        for heading, prefix, empty_caption in _MODALITY_PANELS:
+            st.markdown(f"### {heading}")
+            emotion = state.get(f"{prefix}_emotion")
+            if emotion:
+                st.markdown(
+                    emotion_badge(emotion, state.get(f"{prefix}_confidence", 0.0)),
+                    unsafe_allow_html=True,
+                )
+                ranked = state.get(f"{prefix}_probs_ranked")
+                if ranked:
+                    _display_probability_breakdown(ranked)
+            else:
+                st.caption(empty_caption)
 
         st.markdown("### Group Experience")
-        group_participants = st.session_state.get("group_participants", [])
+        group_participants = state.get("group_participants", [])
         if group_participants:
             st.caption(f"{len(group_participants)} participants in the current group session.")
-            st.table(_group_participants_dataframe(group_participants))
+            st.table(_group_participants_dataframe())
 
-            group_emotion = st.session_state.get("group_emotion")
+            group_emotion = state.get("group_emotion")
+            group_confidence = state.get("group_confidence", 0.0)
+            story_strategy = state.get("story_strategy", "dominant")
             if group_emotion:
-                badge_html = emotion_badge(
-                    group_emotion,
-                    st.session_state.get("group_confidence", 0.0),
-                )
-                st.markdown(badge_html, unsafe_allow_html=True)
+                st.markdown(emotion_badge(group_emotion, group_confidence), unsafe_allow_html=True)
 
-            group_probs = st.session_state.get("group_probs", {})
-            if group_probs:
-                _display_probability_breakdown(group_probs)
+            group_probs = state.get("group_probs", {})
+            group_ranked = state.get("group_probs_ranked")
+            if group_ranked:
+                _display_probability_breakdown(group_ranked)
 
             if st.button(
                 "📖 Generate collaborative story",
@@ -1053,16 +1170,17 @@ def main() -> None:
                 story, ai_used = build_group_story(
                     generator,
                     group_participants,
-                    dominant_emotion=st.session_state.get("group_emotion"),
+                    dominant_emotion=group_emotion,
                     use_ai=use_ai,
                     temperature=temperature,
                     max_tokens=max_tokens,
                     top_p=top_p,
-                    story_strategy=st.session_state.get("story_strategy", "dominant"),
+                    story_strategy=story_strategy,
                     emotion_blend=group_probs,
                     culture_hint=_current_culture(),
+                    min_confidence=confidence_threshold,
                 )
-                st.session_state.update(
+                state.update(
                     {
                         "group_story": story,
                         "group_ai_used": ai_used,
@@ -1071,24 +1189,25 @@ def main() -> None:
                 log_emotion_event(
                     datetime.now().isoformat(),
                     "group_story",
-                    st.session_state.get("group_emotion") or "mixed",
-                    st.session_state.get("group_confidence", 0.0),
+                    group_emotion or "mixed",
+                    group_confidence,
                     details=_emotion_details_json(
                         group_probs,
                         source="group_story",
                         extra={
                             "participants": group_participants,
-                            "strategy": st.session_state.get("story_strategy", "dominant"),
+                            "strategy": story_strategy,
                         },
                     ),
                 )
                 if enable_tts:
-                    generator.narrate_story(story)  # type: ignore[attr-defined]
+                    generator.narrate_story_async(story)  # type: ignore[attr-defined]
 
-            if st.session_state.get("group_story"):
-                if st.session_state.get("group_ai_used"):
+            group_story = state.get("group_story")
+            if group_story:
+                if state.get("group_ai_used"):
                     st.caption("Generated with Hugging Face text-generation pipeline")
-                st.write(st.session_state["group_story"])
+                st.write(group_story)
 
             if st.button(
                 "Clear group session",
@@ -1101,9 +1220,9 @@ def main() -> None:
             st.caption("Capture multiple moods to unlock collaborative stories.")
 
         st.markdown("### Emotion-Adaptive Game")
-        game_session = st.session_state.get("game_session")
-        game_result = st.session_state.get("game_result")
-        if st.session_state.get("game_active") and game_session:
+        game_session = state.get("game_session")
+        game_result = state.get("game_result")
+        if state.get("game_active") and game_session:
             st.subheader(game_session.get("title", ""))
             st.caption(
                 f"Mood: {game_session.get('emotion', 'unknown').title()} • Mode: {game_session.get('difficulty', '').title()}"
@@ -1118,16 +1237,15 @@ def main() -> None:
                 st.audio(soundtrack)
 
             if not game_result:
-                choices = game_session.get("choices", [])
-                if choices:
-                    choice_map = {choice["id"]: choice for choice in choices}
+                choice_ids = game_session.get("_choice_ids", [])
+                if choice_ids:
                     selected_key = st.radio(
                         "Choose your move",
-                        list(choice_map.keys()),
-                        format_func=lambda key: choice_map[key]["text"],
+                        choice_ids,
+                        format_func=game_session["_choice_text"].__getitem__,
                         key="game_choice_radio",
                     )
-                    st.session_state["game_selected_choice"] = selected_key
+                    state["game_selected_choice"] = selected_key
                     if st.button("Lock in move", use_container_width=True) and selected_key:
                         _resolve_game_choice(str(selected_key))
                 else:
@@ -1139,7 +1257,7 @@ def main() -> None:
                     st.success(outcome_text)
                 else:
                     st.warning(outcome_text)
-                st.metric("Total game score", st.session_state.get("game_score", 0))
+                st.metric("Total game score", state.get("game_score", 0))
                 control_cols = st.columns(2)
                 if control_cols[0].button("Next scenario", use_container_width=True):
                     _start_game_session(
@@ -1149,16 +1267,17 @@ def main() -> None:
                 if control_cols[1].button("End session", use_container_width=True):
                     _end_game_session()
         else:
-            if st.session_state.get("game_history"):
+            if state.get("game_history"):
                 st.caption(
-                    f"Total game score: {st.session_state.get('game_score', 0)} • Launch a new scenario to keep the streak going."
+                    f"Total game score: {state.get('game_score', 0)} • Launch a new scenario to keep the streak going."
                 )
             else:
                 st.caption("Launch the adaptive game to unlock mood-reactive mini quests.")
 
-        if st.session_state.get("game_history"):
+        game_history = state.get("game_history")
+        if game_history:
             with st.expander("Game highlights", expanded=False):
-                for event in reversed(st.session_state.get("game_history", [])):
+                for event in reversed(game_history):
                     st.write(
                         f"{event['timestamp']} — {event['emotion'].title()} ({event['difficulty']})"
                     )
@@ -1181,20 +1300,23 @@ def main() -> None:
                 if not rec_map:
                     st.caption("No recommendations available yet. Try again later.")
                 else:
-                    if st.session_state.get("recommendation_feedback_message"):
-                        st.info(st.session_state["recommendation_feedback_message"])
-                        st.session_state["recommendation_feedback_message"] = ""
+                    feedback_message = state.get("recommendation_feedback_message")
+                    if feedback_message:
+                        st.info(feedback_message)
+                        state["recommendation_feedback_message"] = ""
                     st.caption(
                         f"Inspired by your **{active_emotion.title()}** mood—save what resonates!"
                     )
+                    event_time = datetime.now().isoformat()
+                    shown_keys = state["recommendation_shown_keys"]
                     for category, items in rec_map.items():
                         st.subheader(category)
                         for rec in items:
                             key = f"{active_emotion}:{category}:{rec.title}"
-                            if key not in st.session_state["recommendation_shown_keys"]:
-                                st.session_state["recommendation_shown_keys"].append(key)
+                            if key not in shown_keys:
+                                shown_keys.add(key)
                                 log_recommendation_event(
-                                    datetime.now().isoformat(),
+                                    event_time,
                                     active_emotion,
                                     category,
                                     rec.title,
@@ -1212,14 +1334,14 @@ def main() -> None:
                                 key=f"like_{key}",
                             ):
                                 log_recommendation_event(
-                                    datetime.now().isoformat(),
+                                    event_time,
                                     active_emotion,
                                     category,
                                     rec.title,
                                     "liked",
                                     metadata=rec.url,
                                 )
-                                st.session_state["recommendation_feedback_message"] = (
+                                state["recommendation_feedback_message"] = (
                                     f"Saved that you liked {rec.title}."
                                 )
                             if feedback_cols[1].button(
@@ -1227,28 +1349,71 @@ def main() -> None:
                                 key=f"skip_{key}",
                             ):
                                 log_recommendation_event(
-                                    datetime.now().isoformat(),
+                                    event_time,
                                     active_emotion,
                                     category,
                                     rec.title,
                                     "dismissed",
                                     metadata=rec.url,
                                 )
-                                st.session_state["recommendation_feedback_message"] = (
+                                state["recommendation_feedback_message"] = (
                                     f"We'll show fewer picks like {rec.title}."
                                 )
                             st.divider()
 
 
+def _sidebar_slider(
+    label: str,
+    min_value: Any,
+    max_value: Any,
+    default: Any,
+    *,
+    key: str,
+    enabled: bool = True,
+    step: Any = None,
+) -> Any:
+    """Render a slider only while its section is enabled, keeping the last value."""
+
+    state_key = f"_setting_{key}"
+    if not enabled:
+        return st.session_state.get(state_key, default)
+    widget_key = f"_widget_{key}"
+    if widget_key not in st.session_state:
+        st.session_state[widget_key] = st.session_state.get(state_key, default)
+    value = st.slider(label, min_value, max_value, step=step, key=widget_key)
+    st.session_state[state_key] = value
+    return value
+
+
+@lru_cache(maxsize=1)
+def _manual_emotion_options(detector: EmotionDetector) -> Tuple[str, ...]:
+    return ("(Select emotion)", *detector.available_emotions)
+
+
 def _get_profiles() -> Dict[str, UserProfile]:
     profiles = st.session_state.get("profiles", {})
     return profiles if isinstance(profiles, dict) else {}
 
 
+def _set_profiles(profiles: Dict[str, UserProfile], *, mtime: Optional[int] = None) -> None:
+    st.session_state["profiles"] = profiles
+    st.session_state["_profiles_sorted"] = sorted(profiles.keys())
+    st.session_state["_profiles_version"] = st.session_state.get("_profiles_version", 0) + 1
+    st.session_state["_profiles_mtime"] = profiles_mtime() if mtime is None else mtime
+
+
+def _sorted_profile_names() -> List[str]:
+    names = st.session_state.get("_profiles_sorted")
+    if names is None:
+        names = sorted(_get_profiles().keys())
+        st.session_state["_profiles_sorted"] = names
+    return names
+
+
 def _activate_profile(name: str) -> None:
     if st.session_state.get("active_profile_name") != name:
         st.session_state["active_profile_name"] = name
-        st.session_state["recommendation_shown_keys"] = []
+        st.session_state["recommendation_shown_keys"] = set()
 
 
 def _start_profile_edit(name: Optional[str]) -> None:
@@ -1277,7 +1442,7 @@ def _delete_profile(name: str) -> None:
     delete_profile(name)
     profiles = dict(_get_profiles())
     profiles.pop(name, None)
-    st.session_state["profiles"] = profiles
+    _set_profiles(profiles)
     if st.session_state.get("active_profile_name") == name:
         st.session_state["active_profile_name"] = ""
     st.session_state["profile_edit_mode"] = False
@@ -1309,13 +1474,11 @@ def _render_profile_form() -> None:
         ) or ""
 
         culture_default = st.session_state.get("profile_form_culture", "global")
-        culture_codes = list(SUPPORTED_CULTURES.keys())
-        culture_index = culture_codes.index(culture_default) if culture_default in culture_codes else 0
         culture_code = st.selectbox(
             "Cultural background",
-            culture_codes,
-            index=culture_index,
-            format_func=lambda code: SUPPORTED_CULTURES[code],
+            _CULTURE_CODES,
+            index=_CULTURE_INDEX.get(culture_default, 0),
+            format_func=SUPPORTED_CULTURES.__getitem__,
             help="Tailor emotion interpretation and storytelling tone to this cultural lens.",
         )
         st.session_state["profile_form_culture"] = culture_code
@@ -1341,7 +1504,7 @@ def _render_profile_form() -> None:
         upsert_profile(profile)
         profiles = dict(_get_profiles())
         profiles[profile.name] = profile
-        st.session_state["profiles"] = profiles
+        _set_profiles(profiles)
         st.session_state["active_profile_name"] = profile.name
         st.session_state["profile_form_culture"] = normalized_culture
         st.session_state["profile_edit_mode"] = False
@@ -1373,9 +1536,9 @@ def _profile_preview_text(context: Mapping[str, Any]) -> str:
     culture = context.get("culture")
     if isinstance(culture, str) and culture:
         normalized = normalize_culture(culture)
-        culture_label = SUPPORTED_CULTURES.get(normalized, culture.title())
+        culture_label = _culture_label(normalized)
         segments.append(f"Cultural lens: {culture_label}")
-        directives = culture_story_directives(normalized)
+        directives = culture_story_directives(normalized, variety_token=0)
         if isinstance(directives, Mapping):
             settings = directives.get("settings") or []
             if isinstance(settings, str):
@@ -1390,21 +1553,40 @@ def _profile_preview_text(context: Mapping[str, Any]) -> str:
 
 
 def _get_profile_context() -> Optional[Dict[str, Any]]:
+    active = st.session_state.get("active_profile_name")
+    version = st.session_state.get("_profiles_version", 0)
+    cached = st.session_state.get("_active_profile_context")
+    if cached and cached[0] == active and cached[1] == version:
+        return cached[2]
+
     profiles = _get_profiles()
+    context = profiles[active].to_context() if active and active in profiles else None
+    st.session_state["_active_profile_context"] = (active, version, context)
+    return context
+
+
+def _active_profile_preview() -> Optional[str]:
     active = st.session_state.get("active_profile_name")
-    if active and active in profiles:
-        return profiles[active].to_context()
-    return None
+    version = st.session_state.get("_profiles_version", 0)
+    cached = st.session_state.get("_active_profile_preview")
+    if cached and cached[0] == active and cached[1] == version:
+        return cached[2]
+
+    context = _get_profile_context()
+    preview = _profile_preview_text(context) if context else None
+    st.session_state["_active_profile_preview"] = (active, version, preview)
+    return preview
 
 
 def _split_to_list(raw: str) -> List[str]:
-    return [part.strip() for part in raw.split(",") if part.strip()]
+    return [part for part in _LIST_SEPARATOR.split(raw.strip()) if part]
 
 
 def _story_emotion_blend(primary: Optional[str] = None) -> Optional[Dict[str, float]]:
-    for key in ("fused_probs", "face_probs", "voice_probs", "text_probs"):
-        value = st.session_state.get(key)
-        if isinstance(value, dict) and value:
+    state = st.session_state
+    for key in _BLEND_KEYS:
+        value = state.get(key)
+        if value and isinstance(value, dict):
             return value
     if primary:
         return {primary: 100.0}
@@ -1412,9 +1594,17 @@ def _story_emotion_blend(primary: Optional[str] = None) -> Optional[Dict[str, fl
 
 
 def _current_culture() -> str:
-    context = _get_profile_context() or {}
-    culture_code = context.get("culture") if isinstance(context, Mapping) else None
-    return normalize_culture(culture_code if isinstance(culture_code, str) else None)
+    active = st.session_state.get("active_profile_name") or ""
+    version = st.session_state.get("_profiles_version", 0)
+    cached = st.session_state.get("_active_culture")
+    if cached and cached[0] == active and cached[1] == version:
+        return cached[2]
+
+    profile = _get_profiles().get(active)
+    culture_code = getattr(profile, "culture", None)
+    culture = normalize_culture(culture_code if isinstance(culture_code, str) else None)
+    st.session_state["_active_culture"] = (active, version, culture)
+    return culture
 
 
 def _apply_cultural_adjustment(
@@ -1423,22 +1613,57 @@ def _apply_cultural_adjustment(
 ) -> Dict[str, float]:
     if not probabilities:
         return {}
-    return adjust_probabilities(probabilities, _current_culture(), modality=modality)
+    frozen = tuple((str(label), float(value)) for label, value in probabilities.items())
+    return dict(_cultural_adjust_cached(frozen, modality, _current_culture()))
+
+
+@lru_cache(maxsize=512)
+def _cultural_adjust_cached(
+    probabilities: Tuple[Tuple[str, float], ...],
+    modality: str,
+    culture: str,
+) -> Tuple[Tuple[str, float], ...]:
+    return tuple(adjust_probabilities(dict(probabilities), culture, modality=modality).items())
 
 
 def _dominant_from_probabilities(
     probabilities: Mapping[str, float],
     fallback: Optional[Tuple[str, float]] = None,
 ) -> Tuple[Optional[str], float]:
-    filtered = {label: float(value) for label, value in probabilities.items() if float(value) > 0}
-    if filtered:
-        dominant_label, dominant_value = max(filtered.items(), key=lambda kv: kv[1])
-        return dominant_label, float(dominant_value)
+    dominant_label: Optional[str] = None
+    dominant_value = 0.0
+    for label, value in probabilities.items():
+        value = float(value)
+        if value > dominant_value:
+            dominant_label, dominant_value = label, value
+    if dominant_label is not None:
+        return dominant_label, dominant_value
     if fallback:
         return fallback[0], float(fallback[1])
     return None, 0.0
 
 
+class _Detection(NamedTuple):
+    emotion: str
+    confidence: float
+    probabilities: Dict[str, float]
+
+
+def _normalize_detection(
+    probabilities: Optional[Mapping[str, float]],
+    modality: str,
+    *,
+    fallback: Tuple[str, float],
+) -> _Detection:
+    adjusted = _apply_cultural_adjustment(probabilities, modality)
+    emotion, confidence = _dominant_from_probabilities(adjusted, fallback=fallback)
+    return _Detection(
+        emotion or fallback[0],
+        confidence if confidence else float(fallback[1]),
+        adjusted,
+    )
+
+
 def _emotion_details_json(
     probabilities: Optional[Mapping[str, float]],
     *,
@@ -1446,9 +1671,30 @@ def _emotion_details_json(
     extra: Optional[Mapping[str, Any]] = None,
 ) -> str:
     culture_code = _current_culture()
+    if not extra:
+        return _cached_details_json(_freeze_probabilities(probabilities), source, culture_code)
+    payload = _details_payload(probabilities, source, culture_code)
+    payload.update({key: value for key, value in extra.items()})
+    return _dumps_compact(payload)
+
+
+@lru_cache(maxsize=64)
+def _cached_details_json(
+    probabilities: Tuple[Tuple[str, float], ...],
+    source: Optional[str],
+    culture_code: str,
+) -> str:
+    return _dumps_compact(_details_payload(dict(probabilities), source, culture_code))
+
+
+def _details_payload(
+    probabilities: Optional[Mapping[str, float]],
+    source: Optional[str],
+    culture_code: str,
+) -> Dict[str, Any]:
     payload: Dict[str, Any] = {
         "culture": culture_code,
-        "culture_label": SUPPORTED_CULTURES.get(culture_code, culture_code.title()),
+        "culture_label": _culture_label(culture_code),
         "probabilities": {
             str(label): float(value)
             for label, value in (probabilities or {}).items()
@@ -1456,9 +1702,16 @@ def _emotion_details_json(
     }
     if source:
         payload["modality"] = source
-    if extra:
-        payload.update({key: value for key, value in extra.items()})
-    return json.dumps(payload)
+    return payload
+
+
+def _dumps_compact(payload: Mapping[str, Any]) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(payload, separators=_COMPACT_SEPARATORS)
 
 
 def _append_group_participant(
@@ -1478,19 +1731,34 @@ def _append_group_participant(
         "timestamp": datetime.now().isoformat(),
         "culture": _current_culture(),
     }
+    rows = _group_rows()
     st.session_state.setdefault("group_participants", []).append(participant)
+    st.session_state["_group_rows"] = rows + (_participant_row(participant),)
     _update_group_summary()
 
 
 def _set_group_participants(participants: Sequence[Mapping[str, Any]]) -> None:
+    items = list(participants)
+    culture_code = _current_culture()
+    sources = [str(item.get("source") or "face") for item in items]
+
+    adjusted: List[Dict[str, float]] = [{} for _ in items]
+    for source in set(sources):
+        positions = [index for index, name in enumerate(sources) if name == source]
+        batch = adjust_probabilities_batch(
+            [dict(items[index].get("probabilities") or {}) for index in positions],
+            culture_code,
+            modality=source,
+        )
+        for index, probabilities in zip(positions, batch):
+            adjusted[index] = probabilities
+
+    timestamp = datetime.now().isoformat()
     formatted: List[Dict[str, Any]] = []
-    for item in participants:
+    for item, source, adjusted_probs in zip(items, sources, adjusted):
         label = str(item.get("label") or f"Friend {item.get('id', len(formatted) + 1)}")
         emotion = str(item.get("emotion") or "").lower()
         confidence = float(item.get("confidence", 0.0))
-        probabilities = dict(item.get("probabilities") or {})
-        source = str(item.get("source") or "face")
-        adjusted_probs = _apply_cultural_adjustment(probabilities, source)
         dominant_entry, dominant_conf = _dominant_from_probabilities(
             adjusted_probs,
             fallback=(emotion, confidence),
@@ -1502,96 +1770,119 @@ def _set_group_participants(participants: Sequence[Mapping[str, Any]]) -> None:
                 "confidence": dominant_conf if dominant_conf else confidence,
                 "probabilities": adjusted_probs,
                 "source": source,
-                "culture": item.get("culture") or _current_culture(),
-                "timestamp": datetime.now().isoformat(),
+                "culture": item.get("culture") or culture_code,
+                "timestamp": timestamp,
             }
         )
 
     st.session_state["group_participants"] = formatted
+    st.session_state["_group_rows"] = tuple(_participant_row(item) for item in formatted)
     _update_group_summary()
 
 
 def _update_group_summary() -> None:
-    participants: List[Dict[str, Any]] = list(st.session_state.get("group_participants", []))
-    if not participants:
+    rows = _group_rows()
+    if not rows:
         st.session_state.update(
             {
                 "group_emotion": "",
                 "group_confidence": 0.0,
-                "group_probs": {},
+                **_probability_slot("group_probs", {}),
             }
         )
         return
 
     aggregation = st.session_state.get("group_aggregation", "majority")
+    frozen = tuple((emotion, confidence, probs) for _, emotion, confidence, probs, _, _ in rows)
+    emotion, confidence, probs = _aggregate_group(aggregation, frozen)
+
+    st.session_state.update(
+        {
+            "group_emotion": emotion or "mixed",
+            "group_confidence": confidence,
+            **_probability_slot("group_probs", dict(probs)),
+            "group_story": "",
+            "group_ai_used": False,
+        }
+    )
+
+
+def _freeze_probabilities(probabilities: Any) -> Tuple[Tuple[str, float], ...]:
+    if not isinstance(probabilities, Mapping):
+        return ()
+    return tuple((str(label), float(value)) for label, value in probabilities.items())
+
+
+def _canonical_probabilities(probabilities: Any) -> Tuple[Tuple[str, float], ...]:
+    """Freeze a participant map with lowercase labels, merging case variants by sum."""
+    frozen = _freeze_probabilities(probabilities)
+    if all(label.islower() for label, _ in frozen):
+        return frozen
+    merged: Dict[str, float] = {}
+    for label, value in frozen:
+        label = label.lower()
+        merged[label] = merged.get(label, 0.0) + value
+    return tuple(merged.items())
 
+
+@lru_cache(maxsize=16)
+def _aggregate_group(
+    aggregation: str,
+    participants: Tuple[Tuple[str, float, Tuple[Tuple[str, float], ...]], ...],
+) -> Tuple[str, float, Tuple[Tuple[str, float], ...]]:
     if aggregation == "strongest":
-        strongest = max(participants, key=lambda item: float(item.get("confidence", 0.0)))
-        emotion = strongest.get("emotion", "")
-        confidence = float(strongest.get("confidence", 0.0))
-        probs = _normalize_probabilities(strongest.get("probabilities") or {})
+        emotion, confidence, strongest_probs = max(participants, key=itemgetter(1))
+        # Raw detector confidences are the only unbounded input; vote and blend shares are 0-100.
+        confidence = max(0.0, min(confidence, 100.0))
+        probs = _normalize_probabilities(dict(strongest_probs))
     else:
         if aggregation == "majority":
-            votes = Counter()
-            for item in participants:
-                vote = str(item.get("emotion") or "").lower()
-                if vote:
-                    votes[vote] += 1
-            if votes:
-                total_votes = sum(votes.values())
-                emotion, count = votes.most_common(1)[0]
-                confidence = round((count / total_votes) * 100, 1)
-                probs = {
-                    label: round((value / total_votes) * 100, 1)
-                    for label, value in votes.items()
-                }
+            labels, counts = _tally_votes(vote for vote, _, _ in participants)
+            if labels:
+                shares = (counts / counts.sum() * 100).tolist()
+                top = int(counts.argmax())
+                emotion = labels[top]
+                confidence = round(shares[top], 1)
+                probs = {label: round(share, 1) for label, share in zip(labels, shares)}
             else:
-                emotion = _fallback_group_emotion(participants) or ""
+                emotion = ""
                 confidence = 0.0
                 probs = {}
         else:  # average
-            aggregated: Dict[str, float] = {}
-            contributors = 0
-            for item in participants:
-                item_probs = item.get("probabilities")
-                if isinstance(item_probs, Mapping) and item_probs:
-                    contributors += 1
-                    for label, value in item_probs.items():
-                        aggregated[label.lower()] = aggregated.get(label.lower(), 0.0) + float(value)
-            if aggregated and contributors:
-                average_probs = {
-                    label: value / contributors
-                    for label, value in aggregated.items()
-                }
+            labels = [label for _, _, item_probs in participants for label, _ in item_probs]
+            if labels:
+                contributors = sum(1 for _, _, item_probs in participants if item_probs)
+                values = np.fromiter(
+                    (value for _, _, item_probs in participants for _, value in item_probs),
+                    dtype=float,
+                    count=len(labels),
+                )
+                codes, vocabulary = pd.factorize(np.array(labels, dtype=object))
+                totals = np.zeros(len(vocabulary))
+                np.add.at(totals, codes, values)
+                average_probs = dict(zip(vocabulary.tolist(), (totals / contributors).tolist()))
                 probs = _normalize_probabilities(average_probs)
                 if probs:
-                    emotion = max(probs.items(), key=lambda kv: kv[1])[0]
+                    emotion = max(probs.items(), key=itemgetter(1))[0]
                     confidence = float(probs.get(emotion, 0.0))
                 else:
-                    emotion = _fallback_group_emotion(participants) or ""
+                    emotion = _top_vote(vote for vote, _, _ in participants)
                     confidence = 0.0
             else:
-                emotion = _fallback_group_emotion(participants) or ""
+                emotion = _top_vote(vote for vote, _, _ in participants)
                 confidence = 0.0
                 probs = {}
 
-    confidence = max(0.0, min(float(confidence), 100.0))
-    st.session_state.update(
-        {
-            "group_emotion": emotion or "mixed",
-            "group_confidence": confidence,
-            "group_probs": probs,
-            "group_story": "",
-            "group_ai_used": False,
-        }
-    )
+    return emotion, confidence, tuple(probs.items())
 
 
 def _clear_group_session() -> None:
+    _aggregate_group.cache_clear()
     st.session_state["group_participants"] = []
+    st.session_state["_group_rows"] = ()
     st.session_state["group_emotion"] = ""
     st.session_state["group_confidence"] = 0.0
-    st.session_state["group_probs"] = {}
+    st.session_state.update(_probability_slot("group_probs", {}))
     st.session_state["group_story"] = ""
     st.session_state["group_ai_used"] = False
 
@@ -1600,73 +1891,115 @@ def _log_group_event(source: str) -> None:
     participants = st.session_state.get("group_participants", [])
     if not participants:
         return
+    culture_code = _current_culture()
     payload = {
         "participants": participants,
         "aggregation": st.session_state.get("group_aggregation", "majority"),
         "blend": st.session_state.get("group_probs", {}),
-        "culture": _current_culture(),
-        "culture_label": SUPPORTED_CULTURES.get(_current_culture(), _current_culture().title()),
+        "culture": culture_code,
+        "culture_label": _culture_label(culture_code),
     }
     log_emotion_event(
-        datetime.now().isoformat(),
+        participants[-1].get("timestamp") or datetime.now().isoformat(),
         f"group_{source}",
         st.session_state.get("group_emotion") or "mixed",
         st.session_state.get("group_confidence", 0.0),
-        details=json.dumps(payload),
+        details=_dumps_compact(payload),
     )
 
 
-def _fallback_group_emotion(participants: Sequence[Mapping[str, Any]]) -> Optional[str]:
-    counts = Counter()
-    for item in participants:
-        emotion = str(item.get("emotion") or "").lower()
+def _tally_votes(emotions: Iterable[str]) -> Tuple[List[str], np.ndarray]:
+    """Count non-empty votes, labels in first-seen order for stable ties."""
+    slots: Dict[str, int] = {}
+    counts: List[int] = []
+    for emotion in emotions:
         if not emotion:
             continue
-        counts[emotion] += 1
-    if not counts:
-        return None
-    return counts.most_common(1)[0][0]
-
-
-def _group_participants_dataframe(participants: Sequence[Mapping[str, Any]]) -> pd.DataFrame:
-    records = []
-    for index, item in enumerate(participants, start=1):
-        probs = item.get("probabilities") or {}
-        summary = _summarize_probabilities(probs)
-        records.append(
-            {
-                "#": index,
-                "Label": item.get("label", f"Friend {index}"),
-                "Emotion": str(item.get("emotion") or "").title(),
-                "Confidence": round(float(item.get("confidence", 0.0)), 1),
-                "Snapshot": summary,
-                "Source": item.get("source", "face"),
-                "Culture": SUPPORTED_CULTURES.get(
-                    normalize_culture(item.get("culture") if isinstance(item.get("culture"), str) else None),
-                    str(item.get("culture") or "").title(),
-                ),
-            }
-        )
-    return pd.DataFrame.from_records(records)
+        slot = slots.get(emotion)
+        if slot is None:
+            slots[emotion] = len(counts)
+            counts.append(1)
+        else:
+            counts[slot] += 1
+    return list(slots), np.array(counts, dtype=np.int64)
+
+
+def _top_vote(emotions: Iterable[str]) -> str:
+    labels, counts = _tally_votes(emotions)
+    return labels[int(counts.argmax())] if labels else ""
+
+
+def _fallback_group_emotion(participants: Sequence[Mapping[str, Any]]) -> Optional[str]:
+    return _top_vote(str(item.get("emotion") or "").lower() for item in participants) or None
+
+
+def _participant_row(item: Mapping[str, Any]) -> Tuple[Any, ...]:
+    return (
+        item.get("label"),
+        str(item.get("emotion") or "").lower(),
+        float(item.get("confidence", 0.0)),
+        _canonical_probabilities(item.get("probabilities")),
+        item.get("source", "face"),
+        item.get("culture"),
+    )
+
+
+def _group_rows() -> Tuple[Tuple[Any, ...], ...]:
+    """Hashable per-participant rows, maintained alongside ``group_participants`` on write."""
+    participants = st.session_state.get("group_participants", [])
+    rows = st.session_state.get("_group_rows")
+    if rows is None or len(rows) != len(participants):
+        rows = tuple(_participant_row(item) for item in participants)
+        st.session_state["_group_rows"] = rows
+    return rows
+
+
+def _group_participants_dataframe() -> pd.DataFrame:
+    return _participants_frame(_group_rows())
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _participants_frame(rows: Tuple[Tuple[Any, ...], ...]) -> pd.DataFrame:
+    labels, emotions, confidences, snapshots, sources, cultures = [], [], [], [], [], []
+    for index, (label, emotion, confidence, probs, source, culture) in enumerate(rows, start=1):
+        labels.append(label if label is not None else f"Friend {index}")
+        emotions.append(emotion.title())
+        confidences.append(round(confidence, 1))
+        snapshots.append(_summarize_probabilities(dict(probs)))
+        sources.append(source)
+        cultures.append(_culture_label(culture if isinstance(culture, str) else None))
+    return pd.DataFrame(
+        {
+            "#": range(1, len(rows) + 1),
+            "Label": labels,
+            "Emotion": emotions,
+            "Confidence": confidences,
+            "Snapshot": snapshots,
+            "Source": sources,
+            "Culture": cultures,
+        }
+    )
+
+
+def _culture_label(culture: Optional[str]) -> str:
+    return SUPPORTED_CULTURES.get(culture or "") or SUPPORTED_CULTURES[normalize_culture(culture)]
 
 
 def _summarize_probabilities(probabilities: Mapping[str, float]) -> str:
     if not probabilities:
         return "-"
-    top_items = sorted(probabilities.items(), key=lambda kv: kv[1], reverse=True)[:3]
+    top_items = nlargest(3, probabilities.items(), key=itemgetter(1))
     return ", ".join(f"{label.title()} {value:.0f}%" for label, value in top_items if value > 0)
 
 
 def _normalize_probabilities(probabilities: Mapping[str, float]) -> Dict[str, float]:
-    if not probabilities:
-        return {}
-    total = sum(float(value) for value in probabilities.values())
+    total = sum(probabilities.values())
     if total <= 0:
         return {}
     return {
-        str(label).lower(): round((float(value) / total) * 100, 1)
+        label: round((value / total) * 100, 1)
         for label, value in probabilities.items()
-        if float(value) > 0
+        if value > 0
     }
 
 
@@ -1725,6 +2058,10 @@ def _start_game_session(
     payload = scenario.to_payload()
     payload["confidence"] = confidence
     payload["trigger"] = "auto" if auto_trigger else "manual"
+    choices = payload.get("choices", [])
+    payload["_choice_ids"] = [choice["id"] for choice in choices]
+    payload["_choice_text"] = {choice["id"]: choice["text"] for choice in choices}
+    payload["_choices_by_id"] = {choice["id"]: choice for choice in choices}
 
     st.session_state["game_active"] = True
     st.session_state["game_session"] = payload
@@ -1739,8 +2076,10 @@ def _start_game_session(
 
 def _resolve_game_choice(choice_id: str) -> None:
     scenario = st.session_state.get("game_session") or {}
-    choices = scenario.get("choices", [])
-    choice = next((item for item in choices if item.get("id") == choice_id), None)
+    choices_by_id = scenario.get("_choices_by_id")
+    if choices_by_id is None:
+        choices_by_id = {item.get("id"): item for item in scenario.get("choices", [])}
+    choice = choices_by_id.get(choice_id)
     if not choice:
         return
 
@@ -1788,42 +2127,56 @@ def _end_game_session(*, reset_score: bool = False) -> None:
         st.session_state["game_history"] = []
 
 
-def _probability_dataframe(probabilities: Dict[str, float]) -> pd.DataFrame:
-    if not probabilities:
-        return pd.DataFrame(columns=["Emotion", "Confidence (%)"])
-    items = sorted(probabilities.items(), key=lambda kv: kv[1], reverse=True)
-    return pd.DataFrame(items, columns=["Emotion", "Confidence (%)"])
+def _rank_probabilities(probabilities: Mapping[str, float]) -> Tuple[Tuple[str, float], ...]:
+    return tuple(sorted(probabilities.items(), key=itemgetter(1), reverse=True))
 
 
-def _display_probability_breakdown(probabilities: Dict[str, float]) -> None:
-    if not probabilities:
+def _probability_slot(slot: str, probabilities: Dict[str, float]) -> Dict[str, Any]:
+    """Session-state entries for a probability map plus its ranked view.
+
+    Ranking happens once per write so reruns render the breakdown without
+    sorting again.
+    """
+    return {slot: probabilities, f"{slot}_ranked": _rank_probabilities(probabilities)}
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _probability_frame(ranked: Tuple[Tuple[str, float], ...]) -> pd.DataFrame:
+    labels, values = zip(*ranked)
+    return pd.DataFrame({"Confidence (%)": values}, index=pd.Index(labels, name="Emotion"))
+
+
+def _display_probability_breakdown(ranked: Sequence[Tuple[str, float]]) -> None:
+    if not ranked:
         return
-    df = _probability_dataframe(probabilities)
-    st.bar_chart(df.set_index("Emotion"))
+    df = _probability_frame(tuple(ranked))
+    st.bar_chart(df)
     st.table(df)
 
 
-def _append_history(story: str, emotion: str, confidence: float, ai_used: bool) -> None:
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def _append_history(
+    story: str,
+    emotion: str,
+    confidence: float,
+    ai_used: bool,
+    *,
+    created_at: Optional[datetime] = None,
+) -> None:
     st.session_state["history"].append(
         {
             "story": story,
             "emotion": emotion,
             "confidence": confidence,
-            "timestamp": timestamp,
+            "timestamp": (created_at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S"),
             "ai_used": ai_used,
         }
     )
 
 
 def _resolve_primary_emotion() -> Optional[str]:
-    candidates = [
-        st.session_state.get("fused_emotion"),
-        st.session_state.get("current_emotion"),
-        st.session_state.get("voice_emotion"),
-        st.session_state.get("text_emotion"),
-    ]
-    for value in candidates:
+    state = st.session_state
+    for key in _PRIMARY_EMOTION_KEYS:
+        value = state.get(key)
         if value:
             return value
     return None
@@ -5,7 +5,10 @@ Utilities for adapting emotion handling and storytelling to cultural contexts.
 from __future__ import annotations
 
 import random
-from typing import Dict, Iterable, Mapping, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
 DEFAULT_CULTURE = "global"
 
@@ -75,10 +78,23 @@ _CULTURE_LIBRARY: Dict[str, Dict[str, object]] = {
     },
 }
 
+# (culture, modality) -> label multipliers, flattened once so lookups skip the nested library.
+_WEIGHT_TABLE: Dict[Tuple[str, str], Dict[str, float]] = {
+    (culture, modality): {label.lower(): float(weight) for label, weight in weights.items()}
+    for culture, data in _CULTURE_LIBRARY.items()
+    for modality, weights in data.get("probability_weights", {}).items()  # type: ignore[union-attr]
+}
+_NO_WEIGHTS: Dict[str, float] = {}
+
 
 def normalize_culture(code: Optional[str]) -> str:
     if not code:
         return DEFAULT_CULTURE
+    return _normalize_culture_code(code)
+
+
+@lru_cache(maxsize=128)
+def _normalize_culture_code(code: str) -> str:
     lowered = code.strip().lower()
     return lowered if lowered in SUPPORTED_CULTURES else DEFAULT_CULTURE
 
@@ -89,26 +105,21 @@ def adjust_probabilities(
     *,
     modality: str,
 ) -> Dict[str, float]:
-    normalized = normalize_culture(culture)
     if not probabilities:
         return {}
 
-    weights = (
-        _CULTURE_LIBRARY.get(normalized, {})
-        .get("probability_weights", {})  # type: ignore[union-attr]
-        .get(modality, {})  # type: ignore[union-attr]
-    )
+    weights = _WEIGHT_TABLE.get((normalize_culture(culture), modality), _NO_WEIGHTS)
 
     weighted: Dict[str, float] = {}
     for label, value in probabilities.items():
         base = float(value)
         if base <= 0:
             continue
-        multiplier = float(weights.get(label.lower(), 1.0))
-        weighted[label.lower()] = base * multiplier
+        label = label.lower()
+        weighted[label] = base * weights.get(label, 1.0)
 
     if not weighted:
-        return {label.lower(): float(value) for label, value in probabilities.items() if float(value) > 0}
+        return {}
 
     total = sum(weighted.values())
     if total <= 0:
@@ -117,8 +128,61 @@ def adjust_probabilities(
     return {label: round((value / total) * 100, 1) for label, value in weighted.items()}
 
 
-def culture_story_directives(culture: Optional[str]) -> Dict[str, object]:
+def adjust_probabilities_batch(
+    batch: Sequence[Mapping[str, float]],
+    culture: Optional[str],
+    *,
+    modality: str,
+) -> List[Dict[str, float]]:
+    """Apply :func:`adjust_probabilities` to many distributions in one array pass."""
+
+    weights = _WEIGHT_TABLE.get((normalize_culture(culture), modality), _NO_WEIGHTS)
+
+    rows = [
+        {label.lower(): float(value) for label, value in item.items() if float(value) > 0}
+        for item in batch
+    ]
+    labels = sorted({label for row in rows for label in row})
+    if not labels:
+        return [{} for _ in rows]
+
+    index = {label: position for position, label in enumerate(labels)}
+    values = np.zeros((len(rows), len(labels)), dtype=np.float64)
+    for row_index, row in enumerate(rows):
+        for label, value in row.items():
+            values[row_index, index[label]] = value
+
+    multipliers = np.array([weights.get(label, 1.0) for label in labels])
+    weighted = values * multipliers
+    totals = weighted.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shares = np.where(totals > 0, weighted / totals * 100, 0.0).tolist()
+
+    return [
+        {label: round(row_shares[index[label]], 1) for label in row}
+        for row, row_shares in zip(rows, shares)
+    ]
+
+
+def culture_story_directives(
+    culture: Optional[str],
+    *,
+    variety_token: Optional[int] = None,
+) -> Dict[str, object]:
+    """Sample story directives; a ``variety_token`` makes the sample reproducible and memoised."""
     normalized = normalize_culture(culture)
+    if variety_token is None:
+        return _build_directives(normalized, random)
+    cached = _seeded_directives(normalized, variety_token)
+    return {key: list(value) if isinstance(value, list) else value for key, value in cached.items()}
+
+
+@lru_cache(maxsize=32)
+def _seeded_directives(normalized: str, variety_token: int) -> Dict[str, object]:
+    return _build_directives(normalized, random.Random(f"{normalized}:{variety_token}"))
+
+
+def _build_directives(normalized: str, rng: Any) -> Dict[str, object]:
     data = _CULTURE_LIBRARY.get(normalized, {})
     story = data.get("story", {})  # type: ignore[assignment]
     if not isinstance(story, dict):
@@ -133,7 +197,7 @@ def culture_story_directives(culture: Optional[str]) -> Dict[str, object]:
         pool = [item for item in items if item]
         if not pool:
             return []
-        return random.sample(pool, k=min(count, len(pool)))
+        return rng.sample(pool, k=min(count, len(pool)))
 
     return {
         "culture": SUPPORTED_CULTURES.get(normalized, normalized.title()),
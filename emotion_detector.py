@@ -4,20 +4,35 @@ Provides real-time facial emotion detection using the webcam and DeepFace.
 
 from __future__ import annotations
 
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import cv2
+import numpy as np
 from deepface import DeepFace
 
+try:  # mediapipe gives DeepFace a far faster face detector than the Haar cascade
+    import mediapipe
+except ImportError:  # pragma: no cover
+    mediapipe = None
+
 
 class EmotionDetector:
     """Detect emotions from webcam frames leveraging DeepFace analysis."""
 
-    DEFAULT_BACKEND = "opencv"
+    DEFAULT_BACKEND = "mediapipe" if mediapipe is not None else "opencv"
+    ANALYSIS_INTERVAL_SECONDS = 0.2
+    ANALYSIS_MAX_SIDE = 480
+    # Mean grey-level change on a 16x16 thumbnail below which the previous result is reused.
+    FRAME_REUSE_TOLERANCE = 3.0
+    # Expression changes barely move the thumbnail, so re-run DeepFace at least this often.
+    FRAME_REUSE_MAX_SECONDS = 1.0
+    # Output order of DeepFace's Mini-Xception emotion classifier.
+    EMOTION_LABELS = ("angry", "disgust", "fear", "happy", "sad", "surprise", "neutral")
 
     def __init__(self) -> None:
-        """Prepare the detector; the DeepFace model loads lazily on first use."""
+        """Prepare the detector and start loading the DeepFace model in the background."""
         self._last_emotion: Optional[str] = None
         self._last_confidence: float = 0.0
         self._last_probabilities: Dict[str, float] = {}
@@ -30,7 +45,15 @@ class EmotionDetector:
             "fear",
             "neutral",
         ]
-        print("EmotionDetector ready. DeepFace model loads on first analysis.")
+        self._emotion_model: Any = None
+        self._last_fingerprint: Optional[Tuple[Tuple[int, ...], Any]] = None
+        self._last_participants: List[Dict[str, Any]] = []
+        self._last_analysed_at = 0.0
+        self._warm = False
+        self._warm_lock = threading.Lock()
+        self._warmup_thread = threading.Thread(target=self.warmup, name="deepface-warmup", daemon=True)
+        self._warmup_thread.start()
+        print("EmotionDetector ready. DeepFace model is warming up in the background.")
 
     @property
     def available_emotions(self) -> Tuple[str, ...]:
@@ -39,6 +62,7 @@ class EmotionDetector:
 
     def detect_emotion(self, frame: Any) -> Tuple[Optional[str], float, Any, Dict[str, float]]:
         """Analyze a single frame and annotate it with bounding box and labels."""
+        self._reset_frame_reuse()
         try:
             annotated, results = self._analyze_frame(frame)
         except Exception as error:  # DeepFace can throw when no face is detected
@@ -59,6 +83,32 @@ class EmotionDetector:
 
         return dominant_emotion, confidence, annotated, probabilities
 
+    def warmup(self) -> None:
+        """Load the DeepFace detector and emotion model with a blank frame."""
+        with self._warm_lock:
+            if self._warm:
+                return
+            try:
+                blank = np.zeros((48, 48, 3), dtype=np.uint8)
+                self._emotion_model = self._load_emotion_model()
+                if self._emotion_model is not None:
+                    DeepFace.extract_faces(
+                        img_path=blank,
+                        detector_backend=self.DEFAULT_BACKEND,
+                        enforce_detection=False,
+                    )
+                    self._emotion_model.predict(np.zeros((1, 48, 48, 1), dtype=np.float32), verbose=0)
+                else:
+                    DeepFace.analyze(
+                        img_path=blank,
+                        actions=["emotion"],
+                        enforce_detection=False,
+                        detector_backend=self.DEFAULT_BACKEND,
+                    )
+                self._warm = True
+            except Exception as error:
+                print(f"DeepFace warmup failed: {error}")
+
     def start_webcam_scan(
         self,
         confidence_threshold: float = 40.0,
@@ -68,43 +118,66 @@ class EmotionDetector:
         Open the webcam, stream frames, and return the first emotion above the threshold.
         """
 
-        cap = cv2.VideoCapture(0)
+        cap = self._open_camera()
         if not cap.isOpened():
             print("Error: Could not open webcam.")
             return None
 
         print("Webcam scan started. Press 'q' to cancel early.")
+        self._reset_frame_reuse()
         start_time = time.time()
 
         detected: Optional[Tuple[str, float, Dict[str, float]]] = None
+        camera = _CameraWorker(cap).start()
+        analyzer = _AnalysisWorker(
+            camera,
+            self._analyze_participants,
+            self.ANALYSIS_INTERVAL_SECONDS,
+            "DeepFace analysis failed",
+        ).start()
+        results: List[Dict[str, Any]] = []
+        seen = shown = 0
 
-        while True:
-            if (time.time() - start_time) > timeout_seconds:
-                print("Scan timed out without confident prediction.")
-                break
-
-            ret, frame = cap.read()
-            if not ret:
-                print("Error: Can't receive frame. Exiting ...")
-                break
-
-            frame = cv2.flip(frame, 1)
-            emotion, confidence, annotated_frame, probabilities = self.detect_emotion(frame)
-
-            if emotion and confidence >= confidence_threshold:
-                detected = (emotion, confidence, probabilities)
-                cv2.imshow("Emotion Scan", annotated_frame)
-                cv2.waitKey(1000)
-                break
-
-            cv2.imshow("Emotion Scan - Press 'q' to quit", annotated_frame)
-
-            if cv2.waitKey(1) & 0xFF == ord("q"):
-                print("Scan cancelled by user.")
-                break
+        try:
+            while True:
+                if (time.time() - start_time) > timeout_seconds:
+                    print("Scan timed out without confident prediction.")
+                    break
+                if camera.failed:
+                    print("Error: Can't receive frame. Exiting ...")
+                    break
 
-        cap.release()
-        cv2.destroyAllWindows()
+                result_seq, frame, latest = analyzer.latest()
+                if result_seq != seen:
+                    seen, results = result_seq, latest
+                    if results:
+                        primary = results[0]
+                        self._last_emotion = primary.get("emotion")
+                        self._last_confidence = float(primary.get("confidence", 0.0))
+                        self._last_probabilities = dict(primary.get("probabilities", {}))
+                        if self._last_emotion and self._last_confidence >= confidence_threshold:
+                            detected = (
+                                self._last_emotion,
+                                self._last_confidence,
+                                self._last_probabilities,
+                            )
+                            cv2.imshow("Emotion Scan", self._annotated(frame, results))
+                            cv2.waitKey(1000)
+                            break
+
+                preview_seq, preview = camera.latest()
+                if preview is not None and preview_seq != shown:
+                    shown = preview_seq
+                    cv2.imshow("Emotion Scan - Press 'q' to quit", self._annotated(preview, results))
+
+                if cv2.waitKey(1) & 0xFF == ord("q"):
+                    print("Scan cancelled by user.")
+                    break
+        finally:
+            analyzer.stop()
+            camera.stop()
+            cap.release()
+            cv2.destroyAllWindows()
 
         return detected
 
@@ -116,51 +189,62 @@ class EmotionDetector:
     ) -> Optional[List[Dict[str, Any]]]:
         """Capture multiple faces and return per-participant emotion details."""
 
-        cap = cv2.VideoCapture(0)
+        cap = self._open_camera()
         if not cap.isOpened():
             print("Error: Could not open webcam for group scan.")
             return None
 
         print("Group scan started. Press 'q' to cancel early.")
+        self._reset_frame_reuse()
         start_time = time.time()
         group_results: Optional[List[Dict[str, Any]]] = None
+        camera = _CameraWorker(cap).start()
+        analyzer = _AnalysisWorker(
+            camera,
+            self._analyze_participants,
+            self.ANALYSIS_INTERVAL_SECONDS,
+            "DeepFace group analysis failed",
+        ).start()
+        results: List[Dict[str, Any]] = []
+        seen = shown = 0
 
-        while True:
-            if (time.time() - start_time) > timeout_seconds:
-                print("Group scan timed out without confident prediction.")
-                break
-
-            ret, frame = cap.read()
-            if not ret:
-                print("Error: Can't receive frame. Exiting ...")
-                break
-
-            frame = cv2.flip(frame, 1)
-
-            try:
-                annotated_frame, results = self._analyze_frame(frame)
-            except Exception as error:
-                print(f"DeepFace group analysis failed: {error}")
-                annotated_frame = frame
-                results = []
-
-            if results:
-                confidences = [float(entry.get("confidence", 0.0)) for entry in results]
-                best_confidence = max(confidences) if confidences else 0.0
-                if len(results) >= min_participants and best_confidence >= confidence_threshold:
-                    group_results = results
-                    cv2.imshow("Group Emotion Scan", annotated_frame)
-                    cv2.waitKey(1000)
+        try:
+            while True:
+                if (time.time() - start_time) > timeout_seconds:
+                    print("Group scan timed out without confident prediction.")
+                    break
+                if camera.failed:
+                    print("Error: Can't receive frame. Exiting ...")
                     break
 
-            cv2.imshow("Group Emotion Scan - Press 'q' to quit", annotated_frame)
-
-            if cv2.waitKey(1) & 0xFF == ord("q"):
-                print("Group scan cancelled by user.")
-                break
-
-        cap.release()
-        cv2.destroyAllWindows()
+                result_seq, frame, latest = analyzer.latest()
+                if result_seq != seen:
+                    seen, results = result_seq, latest
+                    if results:
+                        confidences = [float(entry.get("confidence", 0.0)) for entry in results]
+                        best_confidence = max(confidences) if confidences else 0.0
+                        if len(results) >= min_participants and best_confidence >= confidence_threshold:
+                            group_results = results
+                            cv2.imshow("Group Emotion Scan", self._annotated(frame, results))
+                            cv2.waitKey(1000)
+                            break
+
+                preview_seq, preview = camera.latest()
+                if preview is not None and preview_seq != shown:
+                    shown = preview_seq
+                    cv2.imshow(
+                        "Group Emotion Scan - Press 'q' to quit",
+                        self._annotated(preview, results),
+                    )
+
+                if cv2.waitKey(1) & 0xFF == ord("q"):
+                    print("Group scan cancelled by user.")
+                    break
+        finally:
+            analyzer.stop()
+            camera.stop()
+            cap.release()
+            cv2.destroyAllWindows()
 
         self._last_group_results = group_results or []
         return group_results
@@ -189,30 +273,71 @@ class EmotionDetector:
             for label, value in probabilities.items()
         }
 
+    def _reset_frame_reuse(self) -> None:
+        """Forget the previous analysis so a new scan never starts from an earlier scan's result."""
+        self._last_fingerprint = None
+        self._last_participants = []
+        self._last_analysed_at = 0.0
+
+    @staticmethod
+    def _load_emotion_model() -> Any:
+        """Return DeepFace's Keras emotion classifier, or ``None`` if it cannot be reached."""
+        try:
+            try:
+                model = DeepFace.build_model(task="facial_attribute", model_name="Emotion")
+            except TypeError:  # older DeepFace releases take only the model name
+                model = DeepFace.build_model("Emotion")
+        except Exception as error:
+            print(f"Batched emotion model unavailable, using DeepFace.analyze: {error}")
+            return None
+        model = getattr(model, "model", model)
+        return model if callable(getattr(model, "predict", None)) else None
+
+    @staticmethod
+    def _open_camera() -> Any:
+        """Open the default webcam with a one-frame buffer so analysed frames stay current."""
+        cap = cv2.VideoCapture(0)
+        try:
+            if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+                print("Warning: camera backend ignored the buffer size hint.")
+        except Exception as error:
+            print(f"Warning: could not shrink camera buffer: {error}")
+        return cap
+
     def _analyze_frame(self, frame: Any) -> Tuple[Any, List[Dict[str, Any]]]:
         """Run DeepFace analysis and return annotated frame plus participant details."""
 
-        analysis: Any = DeepFace.analyze(
-            img_path=frame,
-            actions=["emotion"],
-            enforce_detection=False,
-            detector_backend=self.DEFAULT_BACKEND,
-        )
+        participants = self._analyze_participants(frame)
+        return self._annotated(frame, participants), participants
 
-        annotated = frame.copy()
-        analyses: List[Dict[str, Any]] = []
+    def _analyze_participants(self, frame: Any) -> List[Dict[str, Any]]:
+        """Run DeepFace on ``frame`` and return participants, most confident first."""
 
-        if isinstance(analysis, list):
-            analyses = [item for item in analysis if isinstance(item, dict)]
-        elif isinstance(analysis, dict):
-            if "emotion" in analysis:
-                analyses = [analysis]
-            else:
-                analyses = [
-                    value
-                    for value in analysis.values()
-                    if isinstance(value, dict) and value.get("emotion")
-                ]
+        if self._warmup_thread.is_alive():
+            self._warmup_thread.join()
+
+        fingerprint = (
+            frame.shape,
+            cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (16, 16), interpolation=cv2.INTER_AREA).astype(np.int16),
+        )
+        previous = self._last_fingerprint
+        if (
+            previous is not None
+            and time.time() - self._last_analysed_at < self.FRAME_REUSE_MAX_SECONDS
+            and previous[0] == fingerprint[0]
+            and np.abs(fingerprint[1] - previous[1]).mean() < self.FRAME_REUSE_TOLERANCE
+        ):
+            return [dict(item) for item in self._last_participants]
+
+        height, width = frame.shape[:2]
+        scale = min(1.0, self.ANALYSIS_MAX_SIDE / max(height, width, 1))
+        if scale < 1.0:
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        if self._emotion_model is not None:
+            analyses = self._batched_analyses(frame)
+        else:
+            analyses = self._deepface_analyses(frame)
 
         participants: List[Dict[str, Any]] = []
 
@@ -220,6 +345,14 @@ class EmotionDetector:
             dominant = str(item.get("dominant_emotion") or "").lower()
             emotion_scores: Dict[str, float] = dict(item.get("emotion") or {})
             region: Dict[str, int] = dict(item.get("region") or {})
+            if scale < 1.0:
+                region.update(
+                    {
+                        key: int(round(region[key] / scale))
+                        for key in ("x", "y", "w", "h")
+                        if isinstance(region.get(key), (int, float))
+                    }
+                )
             formatted_probs = self.format_probabilities(emotion_scores)
             confidence = (
                 float(formatted_probs.get(dominant, 0.0))
@@ -227,17 +360,109 @@ class EmotionDetector:
                 else 0.0
             )
 
+            participants.append(
+                {
+                    "id": index + 1,
+                    "label": f"Friend {index + 1}",
+                    "emotion": dominant,
+                    "confidence": confidence,
+                    "probabilities": formatted_probs,
+                    "source": "face",
+                    "region": region,
+                }
+            )
+
+        participants.sort(key=lambda item: float(item.get("confidence", 0.0)), reverse=True)
+        self._last_fingerprint = fingerprint
+        self._last_participants = [dict(item) for item in participants]
+        self._last_analysed_at = time.time()
+        return participants
+
+    def _batched_analyses(self, frame: Any) -> List[Dict[str, Any]]:
+        """Detect every face once and score all crops in a single emotion-model pass."""
+
+        faces = [
+            face
+            for face in DeepFace.extract_faces(
+                img_path=frame,
+                detector_backend=self.DEFAULT_BACKEND,
+                enforce_detection=False,
+            )
+            if isinstance(face, dict) and face.get("face") is not None
+        ]
+        if not faces:
+            return []
+
+        batch = np.stack(
+            [
+                cv2.resize(
+                    cv2.cvtColor(np.asarray(face["face"], dtype=np.float32), cv2.COLOR_RGB2GRAY),
+                    (48, 48),
+                )
+                for face in faces
+            ]
+        )[..., np.newaxis]
+        predictions = np.asarray(self._emotion_model.predict(batch, verbose=0))
+
+        return [
+            {
+                "dominant_emotion": self.EMOTION_LABELS[int(scores.argmax())],
+                "emotion": dict(zip(self.EMOTION_LABELS, scores.tolist())),
+                "region": face.get("facial_area") or {},
+            }
+            for face, scores in zip(faces, predictions)
+        ]
+
+    def _deepface_analyses(self, frame: Any) -> List[Dict[str, Any]]:
+        """Fall back to ``DeepFace.analyze``, which runs the emotion model once per face."""
+
+        analysis: Any = DeepFace.analyze(
+            img_path=frame,
+            actions=["emotion"],
+            enforce_detection=False,
+            detector_backend=self.DEFAULT_BACKEND,
+        )
+
+        if isinstance(analysis, list):
+            return [item for item in analysis if isinstance(item, dict)]
+        if isinstance(analysis, dict):
+            if "emotion" in analysis:
+                return [analysis]
+            return [
+                value
+                for value in analysis.values()
+                if isinstance(value, dict) and value.get("emotion")
+            ]
+        return []
+
+    @classmethod
+    def _annotated(cls, frame: Any, participants: List[Dict[str, Any]]) -> Any:
+        """Return an annotated copy of ``frame``, or ``frame`` itself when there is nothing to draw."""
+
+        if not participants:
+            return frame
+        return cls._annotate(frame.copy(), participants)
+
+    @staticmethod
+    def _annotate(frame: Any, participants: List[Dict[str, Any]]) -> Any:
+        """Draw each participant's face box and label onto ``frame`` in place."""
+
+        for item in participants:
+            region = item.get("region") or {}
+            dominant = str(item.get("emotion") or "")
+            confidence = float(item.get("confidence", 0.0))
+
             x = int(region.get("x", 0))
             y = int(region.get("y", 0))
             w = int(region.get("w", 0))
             h = int(region.get("h", 0))
 
             if w and h:
-                cv2.rectangle(annotated, (x, y), (x + w, y + h), (0, 255, 0), 2)
+                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
 
             label_text = dominant.title() if dominant else "Unknown"
             cv2.putText(
-                annotated,
+                frame,
                 f"{label_text} ({confidence:.1f}%)",
                 (max(x, 10), max(y - 10, 25)),
                 cv2.FONT_HERSHEY_SIMPLEX,
@@ -246,17 +471,92 @@ class EmotionDetector:
                 2,
             )
 
-            participants.append(
-                {
-                    "id": index + 1,
-                    "label": f"Friend {index + 1}",
-                    "emotion": dominant,
-                    "confidence": confidence,
-                    "probabilities": formatted_probs,
-                    "source": "face",
-                    "region": region,
-                }
-            )
+        return frame
 
-        participants.sort(key=lambda item: float(item.get("confidence", 0.0)), reverse=True)
-        return annotated, participants
+
+class _CameraWorker:
+    """Read the webcam on a daemon thread, keeping only the newest mirrored frame."""
+
+    def __init__(self, cap: Any) -> None:
+        self._cap = cap
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._frame: Any = None
+        self._seq = 0
+        self.failed = False
+        self._thread = threading.Thread(target=self._run, name="webcam-reader", daemon=True)
+
+    def start(self) -> "_CameraWorker":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def latest(self) -> Tuple[int, Any]:
+        with self._lock:
+            return self._seq, self._frame
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            ret, frame = self._cap.read()
+            if not ret:
+                self.failed = True
+                return
+            frame = cv2.flip(frame, 1)
+            with self._lock:
+                self._frame = frame
+                self._seq += 1
+
+
+class _AnalysisWorker:
+    """Analyse the camera's newest frame on a daemon thread, at most once per interval."""
+
+    def __init__(
+        self,
+        camera: _CameraWorker,
+        analyze: Callable[[Any], List[Dict[str, Any]]],
+        interval: float,
+        error_message: str,
+    ) -> None:
+        self._camera = camera
+        self._analyze = analyze
+        self._interval = interval
+        self._error_message = error_message
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._result: Tuple[int, Any, List[Dict[str, Any]]] = (0, None, [])
+        self._thread = threading.Thread(target=self._run, name="deepface-analysis", daemon=True)
+
+    def start(self) -> "_AnalysisWorker":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        # DeepFace calls cannot be interrupted; wait for the in-flight one so scans never overlap.
+        self._thread.join(timeout=5.0)
+
+    def latest(self) -> Tuple[int, Any, List[Dict[str, Any]]]:
+        """Return ``(sequence, analysed_frame, participants)`` for the newest analysis."""
+        with self._lock:
+            return self._result
+
+    def _run(self) -> None:
+        analysed_seq = 0
+        while not self._stop.is_set():
+            frame_seq, frame = self._camera.latest()
+            if frame is None or frame_seq == analysed_seq:
+                self._stop.wait(0.01)
+                continue
+            analysed_seq = frame_seq
+            started = time.time()
+            try:
+                participants = self._analyze(frame)
+            except Exception as error:  # DeepFace can throw when no face is detected
+                print(f"{self._error_message}: {error}")
+                participants = []
+            with self._lock:
+                self._result = (self._result[0] + 1, frame, participants)
+            self._stop.wait(max(0.0, self._interval - (time.time() - started)))
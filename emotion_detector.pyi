@@ -5,6 +5,11 @@ from typing import Any, Dict, List, Optional, Tuple
 
 class EmotionDetector:
     DEFAULT_BACKEND: str
+    ANALYSIS_INTERVAL_SECONDS: float
+    ANALYSIS_MAX_SIDE: int
+    FRAME_REUSE_TOLERANCE: float
+    FRAME_REUSE_MAX_SECONDS: float
+    EMOTION_LABELS: Tuple[str, ...]
 
     def __init__(self) -> None: ...
 
@@ -13,6 +18,8 @@ class EmotionDetector:
 
     def detect_emotion(self, frame: Any) -> Tuple[Optional[str], float, Any, Dict[str, float]]: ...
 
+    def warmup(self) -> None: ...
+
     def start_webcam_scan(
         self,
         confidence_threshold: float = ...,
@@ -35,4 +42,24 @@ class EmotionDetector:
     @staticmethod
     def format_probabilities(probabilities: Dict[str, float]) -> Dict[str, float]: ...
 
+    def _reset_frame_reuse(self) -> None: ...
+
+    @staticmethod
+    def _load_emotion_model() -> Any: ...
+
+    @staticmethod
+    def _open_camera() -> Any: ...
+
     def _analyze_frame(self, frame: Any) -> Tuple[Any, List[Dict[str, Any]]]: ...
+
+    def _analyze_participants(self, frame: Any) -> List[Dict[str, Any]]: ...
+
+    def _batched_analyses(self, frame: Any) -> List[Dict[str, Any]]: ...
+
+    def _deepface_analyses(self, frame: Any) -> List[Dict[str, Any]]: ...
+
+    @classmethod
+    def _annotated(cls, frame: Any, participants: List[Dict[str, Any]]) -> Any: ...
+
+    @staticmethod
+    def _annotate(frame: Any, participants: List[Dict[str, Any]]) -> Any: ...
@@ -4,14 +4,15 @@ Generate near-term emotion forecasts from historical logs for proactive alerts.
 
 from __future__ import annotations
 
-import math
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from analytics_logger import fetch_events
+from analytics_logger import events_signature, fetch_events_analytics
 
 
 @dataclass
@@ -40,20 +41,24 @@ class EmotionForecaster:
 
     def __init__(self, *, history_limit: int = 720) -> None:
         self.history_limit = history_limit
+        self._cache: Optional[Tuple[Tuple[Any, ...], pd.DataFrame]] = None
 
     def generate_forecast(self, now: Optional[datetime] = None) -> List[ForecastInsight]:
-        history = self._load_history()
+        return list(self.iter_forecast(now))
+
+    def iter_forecast(self, now: Optional[datetime] = None) -> Iterator[ForecastInsight]:
+        """Yield each slot's forecast as soon as it is computed."""
+        history = self._cached_history()
         if history.empty:
-            return []
+            return
 
         now_ts = pd.Timestamp(now or datetime.now())
-        prepared = self._prepare(history, now_ts)
+        prepared = self._with_hours_ago(history, now_ts)
 
         recency_weights = self._recent_distribution(prepared)
         if not recency_weights:
             recency_weights = self._overall_distribution(prepared)
 
-        forecasts: List[ForecastInsight] = []
         previous_emotion: Optional[str] = None
 
         for slot in self.SLOT_DEFINITIONS:
@@ -66,7 +71,7 @@ class EmotionForecaster:
             if not combined:
                 continue
 
-            ranked = sorted(combined.items(), key=lambda kv: kv[1], reverse=True)
+            ranked = sorted(combined.items(), key=itemgetter(1), reverse=True)
             top_emotion, top_score = ranked[0]
             secondary = ranked[1] if len(ranked) > 1 else None
 
@@ -89,23 +94,19 @@ class EmotionForecaster:
 
             previous_emotion = top_emotion
 
-            forecasts.append(
-                ForecastInsight(
-                    label=slot_label,
-                    timestamp=target_time.to_pydatetime(),
-                    emotion=top_emotion,
-                    confidence=confidence,
-                    alert_level=alert["level"],
-                    message=alert["message"],
-                    insights=insights,
-                    secondary=secondary,
-                )
+            yield ForecastInsight(
+                label=slot_label,
+                timestamp=target_time.to_pydatetime(),
+                emotion=top_emotion,
+                confidence=confidence,
+                alert_level=alert["level"],
+                message=alert["message"],
+                insights=insights,
+                secondary=secondary,
             )
 
-        return forecasts
-
     def _load_history(self) -> pd.DataFrame:
-        df = fetch_events(limit=self.history_limit)
+        df = fetch_events_analytics(limit=self.history_limit)
         if df.empty:
             return df
         df = df.copy()
@@ -113,46 +114,82 @@ class EmotionForecaster:
         df.dropna(subset=["timestamp"], inplace=True)
         return df[df["emotion"].notna()]
 
+    def _cached_history(self) -> pd.DataFrame:
+        """Return loaded, time-independent prepared history, reloading only when the log changes."""
+        signature = (self.history_limit, *events_signature())
+        if self._cache is None or self._cache[0] != signature:
+            history = self._load_history()
+            self._cache = (signature, history if history.empty else self._prepare_static(history))
+        return self._cache[1]
+
     def _prepare(self, df: pd.DataFrame, now_ts: pd.Timestamp) -> pd.DataFrame:
+        return self._with_hours_ago(self._prepare_static(df), now_ts)
+
+    @staticmethod
+    def _prepare_static(df: pd.DataFrame) -> pd.DataFrame:
         prepared = df.copy()
-        prepared["emotion"] = prepared["emotion"].astype(str).str.lower()
+        codes, labels = pd.factorize(prepared["emotion"])
+        # Categorical (sorted, like groupby keys) so distributions can bincount its integer codes.
+        prepared["emotion"] = pd.Categorical(pd.Index(labels.astype(str)).str.lower().take(codes))
         prepared["confidence"] = prepared.get("confidence", pd.Series([0.0] * len(prepared))).astype(float)
-        prepared["hours_ago"] = prepared["timestamp"].apply(
-            lambda ts: (now_ts - ts).total_seconds() / 3600.0 if pd.notnull(ts) else float("inf")
-        )
         prepared["weekday"] = prepared["timestamp"].dt.day_name()
         prepared["hour_block"] = (prepared["timestamp"].dt.hour // 6) * 6
         prepared.sort_values("timestamp", ascending=False, inplace=True)
         return prepared
 
+    @staticmethod
+    def _with_hours_ago(prepared: pd.DataFrame, now_ts: pd.Timestamp) -> pd.DataFrame:
+        return prepared.assign(
+            hours_ago=(now_ts - prepared["timestamp"]).dt.total_seconds().div(3600.0).fillna(float("inf"))
+        )
+
     def _recent_distribution(self, df: pd.DataFrame) -> Dict[str, float]:
-        recent = df[df["hours_ago"] <= self.RECENCY_WINDOW_HOURS].copy()
-        if recent.empty:
+        hours_ago = df["hours_ago"].to_numpy()
+        recent = hours_ago <= self.RECENCY_WINDOW_HOURS
+        if not recent.any():
             return {}
-        recent["weight"] = recent["hours_ago"].apply(
-            lambda hours: math.exp(-hours / self.RECENCY_HALFLIFE_HOURS)
-        )
-        scores = recent.groupby("emotion")["weight"].sum().to_dict()
-        return self._normalize(scores)
+        weights = np.exp(-hours_ago[recent] / self.RECENCY_HALFLIFE_HOURS)
+        labels, _, sums = self._emotion_totals(df, recent, weights)
+        return self._normalize(dict(zip(labels, sums.tolist())))
 
     def _pattern_distribution(self, df: pd.DataFrame, target: pd.Timestamp) -> Dict[str, float]:
         weekday = target.day_name()
         block = (target.hour // 6) * 6
 
-        subset = df[(df["weekday"] == weekday) & (df["hour_block"] == block)]
-        if subset.empty:
-            subset = df[df["hour_block"] == block]
-        if subset.empty:
-            subset = df
-        scores = subset.groupby("emotion")["confidence"].mean().to_dict()
+        in_block = df["hour_block"].to_numpy() == block
+        subset: Optional[np.ndarray] = (df["weekday"].to_numpy() == weekday) & in_block
+        if not subset.any():
+            subset = in_block
+        if not subset.any():
+            subset = None
+        confidence = df["confidence"].to_numpy()
+        labels, counts, sums = self._emotion_totals(
+            df, subset, confidence if subset is None else confidence[subset]
+        )
+        present = counts > 0
+        scores = dict(zip(labels[present], (sums[present] / counts[present]).tolist()))
         return self._normalize(scores)
 
     def _overall_distribution(self, df: pd.DataFrame) -> Dict[str, float]:
-        counts = {
-            emotion: float(size)
-            for emotion, size in df.groupby("emotion").size().to_dict().items()
-        }
-        return self._normalize(counts)
+        labels, counts, _ = self._emotion_totals(df)
+        return self._normalize(dict(zip(labels, counts.astype(float).tolist())))
+
+    @staticmethod
+    def _emotion_totals(
+        df: pd.DataFrame,
+        rows: Optional[np.ndarray] = None,
+        weights: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """Return ``(labels, row_counts, weight_sums)`` per emotion over the ``rows`` mask.
+
+        ``weights`` holds one value per selected row; everything runs on raw arrays via ``np.bincount``.
+        """
+        emotions = df["emotion"].array
+        codes = emotions.codes if rows is None else emotions.codes[rows]
+        size = len(emotions.categories)
+        counts = np.bincount(codes, minlength=size)
+        sums = None if weights is None else np.bincount(codes, weights=weights, minlength=size)
+        return emotions.categories.to_numpy(), counts, sums
 
     @staticmethod
     def _normalize(scores: Dict[str, float]) -> Dict[str, float]:
@@ -3,7 +3,6 @@ Combine modality-specific emotion predictions into a unified outcome."""
 
 from __future__ import annotations
 
-from collections import defaultdict
 from typing import Dict, Iterable, Optional, Tuple
 
 
@@ -23,24 +22,25 @@ def fuse_emotions(
     Each modality tuple is (source_name, confidence_percent, probability_map).
     """
 
-    aggregated = defaultdict(float)
-    weights = weights or {}
-
+    aggregated: Dict[str, float] = {}
     for source, confidence, probs in modalities:
         if not probs:
             continue
-        weight = weights.get(source, 1.0)
-        normalized = normalize_probabilities(probs)
-        for emotion, prob in normalized.items():
-            aggregated[emotion] += weight * prob * (confidence / 100.0)
-
+        total = sum(probs.values())
+        if total <= 0:
+            for label in probs:
+                aggregated.setdefault(label, 0.0)
+            continue
+        scale = (weights.get(source, 1.0) if weights else 1.0) * (confidence / 100.0)
+        for label, value in probs.items():
+            aggregated[label] = aggregated.get(label, 0.0) + value / total * scale
     if not aggregated:
         return None, 0.0, {}
 
-    fused_probs = normalize_probabilities(dict(aggregated))
-    dominant_emotion = max(fused_probs.items(), key=lambda kv: kv[1])
-    confidence_percent = round(dominant_emotion[1] * 100, 1)
+    total = sum(aggregated.values())
+    fused = {label: value / total if total > 0 else 0.0 for label, value in aggregated.items()}
+    dominant = max(fused, key=fused.__getitem__)
 
-    return dominant_emotion[0], confidence_percent, {
-        label: round(value * 100, 1) for label, value in fused_probs.items()
-    }
\ No newline at end of file
+    return dominant, round(fused[dominant] * 100, 1), {
+        label: round(value * 100, 1) for label, value in fused.items()
+    }
@@ -72,6 +72,13 @@ def load_profiles(path: Path = _STORE_PATH) -> Dict[str, UserProfile]:
     return _read_store(path)
 
 
+def profiles_mtime(path: Path = _STORE_PATH) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
 def save_profiles(profiles: Dict[str, UserProfile], path: Path = _STORE_PATH) -> None:
     serialisable = {name: asdict(profile) for name, profile in profiles.items()}
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -5,6 +5,8 @@ Local encryption helpers to protect emotion analytics at rest.
 from __future__ import annotations
 
 import base64
+import hashlib
+import hmac
 import os
 from pathlib import Path
 
@@ -14,6 +16,7 @@ _KEY_DIR = Path(".secure")
 _KEY_PATH = _KEY_DIR / "analytics.key"
 _KEY_BITS = 256
 _NONCE_SIZE = 12
+_INDEX_CONTEXT = b"analytics-blind-index"
 
 
 def _ensure_store() -> None:
@@ -54,6 +57,11 @@ def decrypt_text(token: str) -> str:
     return plaintext.decode("utf-8")
 
 
+def blind_index(text: str) -> str:
+    index_key = hmac.new(get_encryption_key(), _INDEX_CONTEXT, hashlib.sha256).digest()
+    return hmac.new(index_key, text.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
 def destroy_key_material() -> None:
     if _KEY_PATH.exists():
         _KEY_PATH.unlink()
@@ -3,9 +3,12 @@
 
 from __future__ import annotations
 
+import queue
 import random
+import threading
 from collections.abc import Iterable as IterableABC
 from functools import lru_cache
+from operator import itemgetter
 from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import pyttsx3
@@ -35,6 +38,9 @@ class StoryGenerator:
         self._tts_rate = default_rate
         self._tts_volume = default_volume
         self._tts_voice = default_voice
+        self._narration_queue: "queue.Queue[str]" = queue.Queue()
+        self._narration_thread: Optional[threading.Thread] = None
+        self._narration_lock = threading.Lock()
 
         try:
             self.tts_engine = pyttsx3.init()
@@ -59,7 +65,6 @@ class StoryGenerator:
         self._tts_rate = rate
         self._tts_volume = max(0.0, min(volume, 1.0))
         self._tts_voice = voice
-        self._configure_tts()
 
     def select_story(self, emotion: str) -> str:
         if emotion not in self.story_templates:
@@ -401,6 +406,34 @@ class StoryGenerator:
             print(f"Error during narration: {error}")
             return False
 
+    def narrate_story_async(self, text: str) -> bool:
+        """Queue narration on the background speaker, replacing any story still waiting."""
+
+        if not text:
+            return False
+        if not self.tts_engine:
+            print("Text-to-speech engine not available.")
+            return False
+        while True:
+            try:
+                self._narration_queue.get_nowait()
+            except queue.Empty:
+                break
+        self._narration_queue.put(text)
+        with self._narration_lock:
+            if self._narration_thread is None or not self._narration_thread.is_alive():
+                self._narration_thread = threading.Thread(
+                    target=self._narration_loop,
+                    name="story-narration",
+                    daemon=True,
+                )
+                self._narration_thread.start()
+        return True
+
+    def _narration_loop(self) -> None:
+        while True:
+            self.narrate_story(self._narration_queue.get())
+
 
 @lru_cache(maxsize=1)
 def _load_text_generator(model_name: str):
@@ -433,7 +466,7 @@ def _describe_emotion_blend(
     if not emotion_blend:
         return "", None
 
-    sorted_items = sorted(emotion_blend.items(), key=lambda kv: kv[1], reverse=True)
+    sorted_items = sorted(emotion_blend.items(), key=itemgetter(1), reverse=True)
     blend_text = ", ".join(
         f"{label.title()} ({value:.0f}%)" for label, value in sorted_items if value > 0
     )
@@ -483,7 +516,7 @@ def _top_secondary_emotion(
     cleaned_exclude = (exclude or "").lower()
     sorted_items = sorted(
         probabilities.items(),
-        key=lambda kv: kv[1],
+        key=itemgetter(1),
         reverse=True,
     )
     for label, value in sorted_items:
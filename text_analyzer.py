@@ -4,6 +4,7 @@ Analyze written input and infer emotion labels."""
 from __future__ import annotations
 
 from collections import defaultdict
+from operator import itemgetter
 from typing import Any, Callable, Dict, Optional, Tuple
 
 try:  # transformers is optional at runtime
@@ -93,7 +94,7 @@ class TextEmotionAnalyzer:
             return None, 0.0, {}
 
         probabilities = {k: v * 100 for k, v in grouped.items()}
-        dominant_label = max(probabilities.items(), key=lambda kv: kv[1])
+        dominant_label = max(probabilities.items(), key=itemgetter(1))
         return dominant_label[0], dominant_label[1], probabilities
 
     @staticmethod
@@ -3,7 +3,9 @@ Capture audio from the system microphone and estimate vocal emotion."""
 
 from __future__ import annotations
 
+import threading
 from collections.abc import Iterable
+from operator import itemgetter
 from typing import Any, Callable, Dict, Optional, Tuple
 
 import numpy as np
@@ -33,17 +35,26 @@ class VoiceEmotionDetector:
         self.duration_seconds = duration_seconds
         self.model_name = model_name
         self._classifier: Optional[Callable[[Any], Iterable[Any]]] = None
+        self._classifier_lock = threading.Lock()
 
     def _ensure_classifier(self) -> None:
-        if self._classifier is None:
-            if pipeline is None:
-                raise ImportError(
-                    "transformers is required for audio classification. Install it to enable voice analysis."
+        with self._classifier_lock:
+            if self._classifier is None:
+                if pipeline is None:
+                    raise ImportError(
+                        "transformers is required for audio classification. Install it to enable voice analysis."
+                    )
+                self._classifier = pipeline(
+                    "audio-classification",
+                    model=self.model_name,
                 )
-            self._classifier = pipeline(
-                "audio-classification",
-                model=self.model_name,
-            )
+
+    def warmup(self) -> None:
+        """Load the classifier ahead of analysis, e.g. while audio is recording."""
+        try:
+            self._ensure_classifier()
+        except Exception as error:
+            print(f"Voice classifier warmup failed: {error}")
 
     def record_audio(self) -> np.ndarray:
         """Record audio from the default microphone."""
@@ -93,7 +104,7 @@ class VoiceEmotionDetector:
         if not probabilities:
             return None, 0.0, {}
 
-        dominant = max(probabilities.items(), key=lambda kv: kv[1])
+        dominant = max(probabilities.items(), key=itemgetter(1))
         return dominant[0], dominant[1], probabilities
 
     def capture_and_analyze(self) -> Tuple[Optional[str], float, Dict[str, float]]: